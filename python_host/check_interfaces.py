@@ -1,51 +1,59 @@
 """
 Check HID interface details to find Raw HID endpoint
 """
+import io
+import sys
+
 import pywinusb.hid as hid
 
 VENDOR_ID = 0x3434
 PRODUCT_ID = 0x0311
 
-print("Analyzing Keychron V1 HID interfaces...")
-print("=" * 80)
+# Collect output and write it once - console writes are slow on Windows
+out = io.StringIO()
+
+print("Analyzing Keychron V1 HID interfaces...", file=out)
+print("=" * 80, file=out)
 
 all_devices = hid.HidDeviceFilter(vendor_id=VENDOR_ID, product_id=PRODUCT_ID).get_devices()
 
 for idx, device in enumerate(all_devices):
-    print(f"\n[Interface {idx}]")
-    print(f"Path: {device.device_path}")
+    print(f"\n[Interface {idx}]", file=out)
+    print(f"Path: {device.device_path}", file=out)
     
     try:
         device.open()
         
         # Get capabilities
-        print(f"  Vendor: {device.vendor_name}")
-        print(f"  Product: {device.product_name}")
-        print(f"  Version: {device.version_number}")
+        print(f"  Vendor: {device.vendor_name}", file=out)
+        print(f"  Product: {device.product_name}", file=out)
+        print(f"  Version: {device.version_number}", file=out)
         
         # Check input reports (device -> host)
         in_reports = device.find_input_reports()
-        print(f"  Input reports: {len(in_reports)}")
+        print(f"  Input reports: {len(in_reports)}", file=out)
         for report in in_reports:
-            print(f"    Report ID: {report.report_id}, Size: {len(report)} bytes")
+            print(f"    Report ID: {report.report_id}, Size: {len(report)} bytes", file=out)
         
         # Check output reports (host -> device)
         out_reports = device.find_output_reports()
-        print(f"  Output reports: {len(out_reports)}")
+        print(f"  Output reports: {len(out_reports)}", file=out)
         for report in out_reports:
-            print(f"    Report ID: {report.report_id}, Size: {len(report)} bytes")
+            print(f"    Report ID: {report.report_id}, Size: {len(report)} bytes", file=out)
         
         # Check feature reports
         feature_reports = device.find_feature_reports()
-        print(f"  Feature reports: {len(feature_reports)}")
+        print(f"  Feature reports: {len(feature_reports)}", file=out)
         
         device.close()
         
     except Exception as e:
-        print(f"  Error: {e}")
+        print(f"  Error: {e}", file=out)
+
+print("\n" + "=" * 80, file=out)
+print("\nLooking for Raw HID interface:", file=out)
+print("  - Should have both input and output reports", file=out)
+print("  - Typically 32 or 33 byte reports", file=out)
+print("  - May be interface with mi_01 or specific usage page", file=out)
 
-print("\n" + "=" * 80)
-print("\nLooking for Raw HID interface:")
-print("  - Should have both input and output reports")
-print("  - Typically 32 or 33 byte reports")
-print("  - May be interface with mi_01 or specific usage page")
+sys.stdout.write(out.getvalue())
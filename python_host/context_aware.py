@@ -3,18 +3,144 @@ Context-Aware Commands System
 Detects active application and provides relevant commands
 """
 
+import bisect
 import logging
+import os
+import ctypes
+import ctypes.wintypes
+import threading
 import win32gui
 import win32process
-import psutil
 import time
-from typing import Dict, List, Optional, Callable
+from collections import OrderedDict
+from functools import partial
+from typing import Dict, List, Optional, Callable, Tuple
 from dataclasses import dataclass
 
 logger = logging.getLogger("KeychronApp.ContextAware")
 
-
-@dataclass
+EVENT_SYSTEM_FOREGROUND = 0x0003
+WINEVENT_OUTOFCONTEXT = 0x0000
+
+WinEventProc = ctypes.WINFUNCTYPE(
+    None,
+    ctypes.wintypes.HANDLE,  # hWinEventHook
+    ctypes.wintypes.DWORD,   # event
+    ctypes.wintypes.HWND,    # hwnd
+    ctypes.wintypes.LONG,    # idObject
+    ctypes.wintypes.LONG,    # idChild
+    ctypes.wintypes.DWORD,   # dwEventThread
+    ctypes.wintypes.DWORD,   # dwmsEventTime
+)
+
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+
+kernel32 = ctypes.windll.kernel32
+kernel32.OpenProcess.argtypes = [ctypes.wintypes.DWORD, ctypes.wintypes.BOOL, ctypes.wintypes.DWORD]
+kernel32.OpenProcess.restype = ctypes.wintypes.HANDLE
+kernel32.QueryFullProcessImageNameW.argtypes = [ctypes.wintypes.HANDLE, ctypes.wintypes.DWORD,
+                                                ctypes.wintypes.LPWSTR, ctypes.POINTER(ctypes.wintypes.DWORD)]
+kernel32.QueryFullProcessImageNameW.restype = ctypes.wintypes.BOOL
+kernel32.CloseHandle.argtypes = [ctypes.wintypes.HANDLE]
+kernel32.CloseHandle.restype = ctypes.wintypes.BOOL
+
+
+def _exe_for_pid(pid: int) -> str:
+    """Get the full executable path of a process"""
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        raise ctypes.WinError()
+    try:
+        buf = ctypes.create_unicode_buffer(1024)
+        size = ctypes.wintypes.DWORD(len(buf))
+        if not kernel32.QueryFullProcessImageNameW(handle, 0, buf, ctypes.byref(size)):
+            raise ctypes.WinError()
+        return buf.value
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+# SendInput structures
+INPUT_KEYBOARD = 1
+KEYEVENTF_KEYUP = 0x0002
+ULONG_PTR = ctypes.c_size_t
+
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [("dx", ctypes.wintypes.LONG),
+                ("dy", ctypes.wintypes.LONG),
+                ("mouseData", ctypes.wintypes.DWORD),
+                ("dwFlags", ctypes.wintypes.DWORD),
+                ("time", ctypes.wintypes.DWORD),
+                ("dwExtraInfo", ULONG_PTR)]
+
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = [("wVk", ctypes.wintypes.WORD),
+                ("wScan", ctypes.wintypes.WORD),
+                ("dwFlags", ctypes.wintypes.DWORD),
+                ("time", ctypes.wintypes.DWORD),
+                ("dwExtraInfo", ULONG_PTR)]
+
+
+class _INPUTUNION(ctypes.Union):
+    # MOUSEINPUT is the largest member; it sets sizeof(INPUT)
+    _fields_ = [("mi", MOUSEINPUT),
+                ("ki", KEYBDINPUT)]
+
+
+class INPUT(ctypes.Structure):
+    _anonymous_ = ("u",)
+    _fields_ = [("type", ctypes.wintypes.DWORD),
+                ("u", _INPUTUNION)]
+
+
+def send_chord(*vks: int):
+    """Press keys in order and release in reverse with a single SendInput call"""
+    count = len(vks) * 2
+    inputs = (INPUT * count)()
+    for i, vk in enumerate(vks):
+        down = inputs[i]
+        down.type = INPUT_KEYBOARD
+        down.ki.wVk = vk
+        up = inputs[count - 1 - i]
+        up.type = INPUT_KEYBOARD
+        up.ki.wVk = vk
+        up.ki.dwFlags = KEYEVENTF_KEYUP
+
+    sent = ctypes.windll.user32.SendInput(count, inputs, ctypes.sizeof(INPUT))
+    if sent != count:
+        logger.warning("SendInput sent %s/%s events", sent, count)
+
+
+# Virtual-key codes (winuser.h) - avoids importing win32con at load time
+VK_TAB = 0x09
+VK_SHIFT = 0x10
+VK_CONTROL = 0x11
+VK_MENU = 0x12  # Alt
+VK_DIVIDE = 0x6F
+VK_F5 = 0x74
+
+# Virtual-key chords for built-in context commands
+_CHORDS = {
+    # Browser
+    'new_tab': (VK_CONTROL, 0x54),  # Ctrl+T
+    'close_tab': (VK_CONTROL, 0x57),  # Ctrl+W
+    'reopen_tab': (VK_CONTROL, VK_SHIFT, 0x54),  # Ctrl+Shift+T
+    'next_tab': (VK_CONTROL, VK_TAB),
+    'prev_tab': (VK_CONTROL, VK_SHIFT, VK_TAB),
+    # Code editors
+    'comment_line': (VK_CONTROL, VK_DIVIDE),  # Ctrl+/
+    'format_document': (VK_SHIFT, VK_MENU, 0x46),  # Shift+Alt+F
+    'find_in_files': (VK_CONTROL, VK_SHIFT, 0x46),  # Ctrl+Shift+F
+    'run_debug': (VK_F5,),
+    # Discord
+    'toggle_mute': (VK_CONTROL, VK_SHIFT, 0x4D),  # Ctrl+Shift+M
+    'toggle_deafen': (VK_CONTROL, VK_SHIFT, 0x44),  # Ctrl+Shift+D
+}
+
+
+@dataclass(slots=True)
 class ContextCommand:
     """A context-specific command"""
     name: str
@@ -23,7 +149,7 @@ class ContextCommand:
     icon: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AppContext:
     """Application context information"""
     process_name: str
@@ -38,17 +164,78 @@ class ContextDetector:
     def __init__(self):
         self.last_context: Optional[AppContext] = None
         self.last_check_time = 0
-        self.check_interval = 0.5  # Check every 500ms
+        self.min_check_interval = 0.5  # Poll every 500ms after a change...
+        self.max_check_interval = 2.0  # ...backing off to 2s while unchanged
+        self.check_interval = self.min_check_interval
+        # (hwnd, pid) -> (process_name, exe_path), most recently used last.
+        # Keying on hwnd too keeps a recycled pid from hitting a stale entry.
+        self._pid_cache: "OrderedDict[Tuple[int, int], Tuple[str, str]]" = OrderedDict()
+        self._pid_cache_size = 64
+
+        # Foreground change notifications (falls back to polling if unavailable)
+        self._dirty = True
+        self._hook_active = False
+        self._hook_proc = WinEventProc(self._on_foreground_changed)
+        self._hook_thread: Optional[threading.Thread] = None  # Started on first use
+
+    def _hook_loop(self):
+        """Install foreground WinEvent hook and pump messages for it"""
+        try:
+            hook = ctypes.windll.user32.SetWinEventHook(
+                EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND,
+                0, self._hook_proc, 0, 0, WINEVENT_OUTOFCONTEXT
+            )
+            if not hook:
+                logger.debug("SetWinEventHook failed, using adaptive polling")
+                return
+
+            self._hook_active = True
+            win32gui.PumpMessages()
+        except Exception as e:
+            logger.debug("Foreground hook unavailable: %s", e)
+        finally:
+            self._hook_active = False
+            self._dirty = True
+
+    def _on_foreground_changed(self, hook, event, hwnd, id_object, id_child, thread_id, event_time):
+        """WinEvent callback - invalidate cached context"""
+        self._dirty = True
+
+    def _get_process_info(self, hwnd: int, pid: int) -> Tuple[str, str]:
+        """Get (process_name, exe_path) for a window's process, cached"""
+        key = (hwnd, pid)
+        cached = self._pid_cache.get(key)
+        if cached is not None:
+            self._pid_cache.move_to_end(key)
+            return cached
+
+        exe_path = _exe_for_pid(pid)
+        info = (os.path.basename(exe_path).lower(), exe_path)
+
+        self._pid_cache[key] = info
+        if len(self._pid_cache) > self._pid_cache_size:
+            self._pid_cache.popitem(last=False)
+
+        return info
 
     def get_current_context(self) -> Optional[AppContext]:
         """Get current active application context"""
+        if self._hook_thread is None:
+            self._hook_thread = threading.Thread(target=self._hook_loop, daemon=True)
+            self._hook_thread.start()
+
+        # Event-driven: nothing to do until the foreground window changes
+        if self._hook_active and not self._dirty and self.last_context:
+            return self.last_context
+
         current_time = time.time()
 
-        # Rate limit checks
-        if current_time - self.last_check_time < self.check_interval:
+        # Rate limit checks (only when the hook isn't reporting changes)
+        if not self._hook_active and current_time - self.last_check_time < self.check_interval:
             return self.last_context
 
         self.last_check_time = current_time
+        self._dirty = False
 
         try:
             # Get foreground window
@@ -56,17 +243,29 @@ class ContextDetector:
             if not hwnd:
                 return None
 
-            # Get window title
+            # Get window title (cheap, and the only field that can change per hwnd)
             window_title = win32gui.GetWindowText(hwnd)
 
+            # Same foreground window - reuse process info
+            last = self.last_context
+            if last and last.hwnd == hwnd:
+                # Unchanged - back off polling
+                self.check_interval = min(self.check_interval * 2, self.max_check_interval)
+                if last.window_title != window_title:
+                    last = AppContext(last.process_name, window_title, last.exe_path, hwnd)
+                    self.last_context = last
+                return last
+
+            self.check_interval = self.min_check_interval
+
             # Get process info
             _, pid = win32process.GetWindowThreadProcessId(hwnd)
-            process = psutil.Process(pid)
+            process_name, exe_path = self._get_process_info(hwnd, pid)
 
             context = AppContext(
-                process_name=process.name().lower(),
+                process_name=process_name,
                 window_title=window_title,
-                exe_path=process.exe(),
+                exe_path=exe_path,
                 hwnd=hwnd
             )
 
@@ -74,15 +273,21 @@ class ContextDetector:
             return context
 
         except Exception as e:
-            logger.debug(f"Error getting context: {e}")
+            logger.debug("Error getting context: %s", e)
             return None
 
 
 class ContextProvider:
     """Base class for context-specific command providers"""
 
+    # Process names this provider applies to. Providers that set this are
+    # dispatched by dict lookup; others fall back to matches().
+    PROCESS_NAMES: Optional[frozenset] = None
+
     def matches(self, context: AppContext) -> bool:
         """Check if this provider matches the given context"""
+        if self.PROCESS_NAMES is not None:
+            return context.process_name in self.PROCESS_NAMES
         raise NotImplementedError
 
     def get_commands(self, context: AppContext) -> List[ContextCommand]:
@@ -101,61 +306,19 @@ class ContextProvider:
 class BrowserContextProvider(ContextProvider):
     """Commands for web browsers"""
 
-    BROWSER_PROCESSES = ['chrome.exe', 'firefox.exe', 'msedge.exe', 'opera.exe', 'brave.exe']
+    BROWSER_PROCESSES = frozenset({'chrome.exe', 'firefox.exe', 'msedge.exe', 'opera.exe', 'brave.exe'})
+    PROCESS_NAMES = BROWSER_PROCESSES
 
-    def matches(self, context: AppContext) -> bool:
-        return context.process_name in self.BROWSER_PROCESSES
+    COMMANDS = [
+        ContextCommand("🌐 New Tab", "Open new tab (Ctrl+T)", partial(send_chord, *_CHORDS['new_tab']), "➕"),
+        ContextCommand("🌐 Close Tab", "Close current tab (Ctrl+W)", partial(send_chord, *_CHORDS['close_tab']), "✖️"),
+        ContextCommand("🌐 Reopen Tab", "Reopen closed tab (Ctrl+Shift+T)", partial(send_chord, *_CHORDS['reopen_tab']), "↩️"),
+        ContextCommand("🌐 Next Tab", "Switch to next tab", partial(send_chord, *_CHORDS['next_tab']), "→"),
+        ContextCommand("🌐 Previous Tab", "Switch to previous tab", partial(send_chord, *_CHORDS['prev_tab']), "←"),
+    ]
 
     def get_commands(self, context: AppContext) -> List[ContextCommand]:
-        import win32api
-        import win32con
-
-        def new_tab():
-            win32api.keybd_event(win32con.VK_CONTROL, 0, 0, 0)
-            win32api.keybd_event(0x54, 0, 0, 0)  # T
-            time.sleep(0.02)
-            win32api.keybd_event(0x54, 0, win32con.KEYEVENTF_KEYUP, 0)
-            win32api.keybd_event(win32con.VK_CONTROL, 0, win32con.KEYEVENTF_KEYUP, 0)
-
-        def close_tab():
-            win32api.keybd_event(win32con.VK_CONTROL, 0, 0, 0)
-            win32api.keybd_event(0x57, 0, 0, 0)  # W
-            time.sleep(0.02)
-            win32api.keybd_event(0x57, 0, win32con.KEYEVENTF_KEYUP, 0)
-            win32api.keybd_event(win32con.VK_CONTROL, 0, win32con.KEYEVENTF_KEYUP, 0)
-
-        def reopen_tab():
-            win32api.keybd_event(win32con.VK_CONTROL, 0, 0, 0)
-            win32api.keybd_event(win32con.VK_SHIFT, 0, 0, 0)
-            win32api.keybd_event(0x54, 0, 0, 0)  # T
-            time.sleep(0.02)
-            win32api.keybd_event(0x54, 0, win32con.KEYEVENTF_KEYUP, 0)
-            win32api.keybd_event(win32con.VK_SHIFT, 0, win32con.KEYEVENTF_KEYUP, 0)
-            win32api.keybd_event(win32con.VK_CONTROL, 0, win32con.KEYEVENTF_KEYUP, 0)
-
-        def next_tab():
-            win32api.keybd_event(win32con.VK_CONTROL, 0, 0, 0)
-            win32api.keybd_event(win32con.VK_TAB, 0, 0, 0)
-            time.sleep(0.02)
-            win32api.keybd_event(win32con.VK_TAB, 0, win32con.KEYEVENTF_KEYUP, 0)
-            win32api.keybd_event(win32con.VK_CONTROL, 0, win32con.KEYEVENTF_KEYUP, 0)
-
-        def prev_tab():
-            win32api.keybd_event(win32con.VK_CONTROL, 0, 0, 0)
-            win32api.keybd_event(win32con.VK_SHIFT, 0, 0, 0)
-            win32api.keybd_event(win32con.VK_TAB, 0, 0, 0)
-            time.sleep(0.02)
-            win32api.keybd_event(win32con.VK_TAB, 0, win32con.KEYEVENTF_KEYUP, 0)
-            win32api.keybd_event(win32con.VK_SHIFT, 0, win32con.KEYEVENTF_KEYUP, 0)
-            win32api.keybd_event(win32con.VK_CONTROL, 0, win32con.KEYEVENTF_KEYUP, 0)
-
-        return [
-            ContextCommand("🌐 New Tab", "Open new tab (Ctrl+T)", new_tab, "➕"),
-            ContextCommand("🌐 Close Tab", "Close current tab (Ctrl+W)", close_tab, "✖️"),
-            ContextCommand("🌐 Reopen Tab", "Reopen closed tab (Ctrl+Shift+T)", reopen_tab, "↩️"),
-            ContextCommand("🌐 Next Tab", "Switch to next tab", next_tab, "→"),
-            ContextCommand("🌐 Previous Tab", "Switch to previous tab", prev_tab, "←"),
-        ]
+        return self.COMMANDS
 
     def get_priority(self) -> int:
         return 10
@@ -168,52 +331,19 @@ class BrowserContextProvider(ContextProvider):
 class CodeEditorContextProvider(ContextProvider):
     """Commands for code editors"""
 
-    EDITOR_PROCESSES = ['code.exe', 'cursor.exe', 'pycharm64.exe', 'idea64.exe',
-                        'sublime_text.exe', 'notepad++.exe', 'devenv.exe']
+    EDITOR_PROCESSES = frozenset({'code.exe', 'cursor.exe', 'pycharm64.exe', 'idea64.exe',
+                                  'sublime_text.exe', 'notepad++.exe', 'devenv.exe'})
+    PROCESS_NAMES = EDITOR_PROCESSES
 
-    def matches(self, context: AppContext) -> bool:
-        return context.process_name in self.EDITOR_PROCESSES
+    COMMANDS = [
+        ContextCommand("💻 Toggle Comment", "Comment/uncomment line", partial(send_chord, *_CHORDS['comment_line']), "💬"),
+        ContextCommand("💻 Format Code", "Format document", partial(send_chord, *_CHORDS['format_document']), "📝"),
+        ContextCommand("💻 Find in Files", "Search across files", partial(send_chord, *_CHORDS['find_in_files']), "🔍"),
+        ContextCommand("💻 Run/Debug", "Start debugging (F5)", partial(send_chord, *_CHORDS['run_debug']), "▶️"),
+    ]
 
     def get_commands(self, context: AppContext) -> List[ContextCommand]:
-        import win32api
-        import win32con
-
-        def comment_line():
-            win32api.keybd_event(win32con.VK_CONTROL, 0, 0, 0)
-            win32api.keybd_event(win32con.VK_DIVIDE, 0, 0, 0)  # /
-            time.sleep(0.02)
-            win32api.keybd_event(win32con.VK_DIVIDE, 0, win32con.KEYEVENTF_KEYUP, 0)
-            win32api.keybd_event(win32con.VK_CONTROL, 0, win32con.KEYEVENTF_KEYUP, 0)
-
-        def format_document():
-            win32api.keybd_event(win32con.VK_SHIFT, 0, 0, 0)
-            win32api.keybd_event(win32con.VK_MENU, 0, 0, 0)  # Alt
-            win32api.keybd_event(0x46, 0, 0, 0)  # F
-            time.sleep(0.02)
-            win32api.keybd_event(0x46, 0, win32con.KEYEVENTF_KEYUP, 0)
-            win32api.keybd_event(win32con.VK_MENU, 0, win32con.KEYEVENTF_KEYUP, 0)
-            win32api.keybd_event(win32con.VK_SHIFT, 0, win32con.KEYEVENTF_KEYUP, 0)
-
-        def find_in_files():
-            win32api.keybd_event(win32con.VK_CONTROL, 0, 0, 0)
-            win32api.keybd_event(win32con.VK_SHIFT, 0, 0, 0)
-            win32api.keybd_event(0x46, 0, 0, 0)  # F
-            time.sleep(0.02)
-            win32api.keybd_event(0x46, 0, win32con.KEYEVENTF_KEYUP, 0)
-            win32api.keybd_event(win32con.VK_SHIFT, 0, win32con.KEYEVENTF_KEYUP, 0)
-            win32api.keybd_event(win32con.VK_CONTROL, 0, win32con.KEYEVENTF_KEYUP, 0)
-
-        def run_debug():
-            win32api.keybd_event(win32con.VK_F5, 0, 0, 0)
-            time.sleep(0.02)
-            win32api.keybd_event(win32con.VK_F5, 0, win32con.KEYEVENTF_KEYUP, 0)
-
-        return [
-            ContextCommand("💻 Toggle Comment", "Comment/uncomment line", comment_line, "💬"),
-            ContextCommand("💻 Format Code", "Format document", format_document, "📝"),
-            ContextCommand("💻 Find in Files", "Search across files", find_in_files, "🔍"),
-            ContextCommand("💻 Run/Debug", "Start debugging (F5)", run_debug, "▶️"),
-        ]
+        return self.COMMANDS
 
     def get_priority(self) -> int:
         return 10
@@ -226,35 +356,15 @@ class CodeEditorContextProvider(ContextProvider):
 class DiscordContextProvider(ContextProvider):
     """Commands for Discord"""
 
-    def matches(self, context: AppContext) -> bool:
-        return context.process_name == 'discord.exe'
+    PROCESS_NAMES = frozenset({'discord.exe'})
+
+    COMMANDS = [
+        ContextCommand("🎮 Toggle Mute", "Mute/unmute microphone", partial(send_chord, *_CHORDS['toggle_mute']), "🎤"),
+        ContextCommand("🎮 Toggle Deafen", "Deafen/undeafen audio", partial(send_chord, *_CHORDS['toggle_deafen']), "🔇"),
+    ]
 
     def get_commands(self, context: AppContext) -> List[ContextCommand]:
-        import win32api
-        import win32con
-
-        def toggle_mute():
-            win32api.keybd_event(win32con.VK_CONTROL, 0, 0, 0)
-            win32api.keybd_event(win32con.VK_SHIFT, 0, 0, 0)
-            win32api.keybd_event(0x4D, 0, 0, 0)  # M
-            time.sleep(0.02)
-            win32api.keybd_event(0x4D, 0, win32con.KEYEVENTF_KEYUP, 0)
-            win32api.keybd_event(win32con.VK_SHIFT, 0, win32con.KEYEVENTF_KEYUP, 0)
-            win32api.keybd_event(win32con.VK_CONTROL, 0, win32con.KEYEVENTF_KEYUP, 0)
-
-        def toggle_deafen():
-            win32api.keybd_event(win32con.VK_CONTROL, 0, 0, 0)
-            win32api.keybd_event(win32con.VK_SHIFT, 0, 0, 0)
-            win32api.keybd_event(0x44, 0, 0, 0)  # D
-            time.sleep(0.02)
-            win32api.keybd_event(0x44, 0, win32con.KEYEVENTF_KEYUP, 0)
-            win32api.keybd_event(win32con.VK_SHIFT, 0, win32con.KEYEVENTF_KEYUP, 0)
-            win32api.keybd_event(win32con.VK_CONTROL, 0, win32con.KEYEVENTF_KEYUP, 0)
-
-        return [
-            ContextCommand("🎮 Toggle Mute", "Mute/unmute microphone", toggle_mute, "🎤"),
-            ContextCommand("🎮 Toggle Deafen", "Deafen/undeafen audio", toggle_deafen, "🔇"),
-        ]
+        return self.COMMANDS
 
     def get_priority(self) -> int:
         return 10
@@ -270,6 +380,11 @@ class ContextAwareManager:
     def __init__(self):
         self.detector = ContextDetector()
         self.providers: List[ContextProvider] = []
+        # process_name -> providers (priority order), plus providers without PROCESS_NAMES
+        self._by_process: Dict[str, List[ContextProvider]] = {}
+        self._generic_providers: List[ContextProvider] = []
+        # process_name -> commands; provider commands don't depend on context
+        self._commands_cache: Dict[str, List[ContextCommand]] = {}
         self.enabled = True
         self._register_default_providers()
 
@@ -281,9 +396,21 @@ class ContextAwareManager:
 
     def register_provider(self, provider: ContextProvider):
         """Register a new context provider"""
-        self.providers.append(provider)
-        # Sort by priority
-        self.providers.sort(key=lambda p: p.get_priority(), reverse=True)
+        # Keep sorted by priority (highest first, ties in registration order)
+        bisect.insort(self.providers, provider, key=lambda p: -p.get_priority())
+        self._rebuild_dispatch()
+
+    def _rebuild_dispatch(self):
+        """Index providers by process name for O(1) lookup"""
+        self._by_process = {}
+        self._generic_providers = []
+        self._commands_cache = {}
+        for provider in self.providers:
+            if provider.PROCESS_NAMES is None:
+                self._generic_providers.append(provider)
+                continue
+            for process_name in provider.PROCESS_NAMES:
+                self._by_process.setdefault(process_name, []).append(provider)
 
     def get_contextual_commands(self) -> List[ContextCommand]:
         """Get commands for current context"""
@@ -294,12 +421,24 @@ class ContextAwareManager:
         if not context:
             return []
 
+        cached = self._commands_cache.get(context.process_name)
+        if cached is not None:
+            return cached
+
+        providers = self._by_process.get(context.process_name, [])
+        if self._generic_providers:
+            providers = providers + [p for p in self._generic_providers if p.matches(context)]
+            providers.sort(key=lambda p: p.get_priority(), reverse=True)
+
         commands = []
-        for provider in self.providers:
-            if provider.matches(context):
-                provider_commands = provider.get_commands(context)
-                commands.extend(provider_commands)
-                logger.debug(f"Added {len(provider_commands)} commands from {provider.__class__.__name__}")
+        for provider in providers:
+            provider_commands = provider.get_commands(context)
+            commands.extend(provider_commands)
+            logger.debug("Added %s commands from %s", len(provider_commands), provider.__class__.__name__)
+
+        # Generic providers may match on more than the process name
+        if not self._generic_providers:
+            self._commands_cache[context.process_name] = commands
 
         return commands
 
@@ -311,8 +450,23 @@ class ContextAwareManager:
         return None
 
 
-# Global instance
-context_manager = ContextAwareManager()
+# Global instance, created on first access so importing this module stays cheap
+_context_manager: Optional[ContextAwareManager] = None
+
+
+def get_context_manager() -> ContextAwareManager:
+    """Get the global ContextAwareManager, creating it on first use"""
+    global _context_manager
+    if _context_manager is None:
+        _context_manager = ContextAwareManager()
+    return _context_manager
+
+
+def __getattr__(name):
+    # Lazy module attribute (PEP 562) for `from context_aware import context_manager`
+    if name == 'context_manager':
+        return get_context_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ============================================================================
@@ -325,6 +479,8 @@ def inject_contextual_commands(command_registry, state_machine):
     This should be called periodically or on command rotation to update
     the available commands based on the active application.
     """
+    context_manager = get_context_manager()
+
     # Get contextual commands
     contextual = context_manager.get_contextual_commands()
 
@@ -342,9 +498,9 @@ def inject_contextual_commands(command_registry, state_machine):
     # Register the context menu command
     # Note: This is a simplified approach. A better implementation would
     # dynamically update the command list or show a separate menu
-    logger.info(f"Found {len(contextual)} contextual commands for {app_name}")
+    logger.info("Found %s contextual commands for %s", len(contextual), app_name)
 
 
 # Export
 __all__ = ['ContextAwareManager', 'ContextProvider', 'ContextCommand',
-           'context_manager', 'inject_contextual_commands']
+           'context_manager', 'get_context_manager', 'inject_contextual_commands']
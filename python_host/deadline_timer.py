@@ -0,0 +1,71 @@
+"""
+Reusable one-shot timer
+
+threading.Timer starts a new OS thread every time it is armed, which the
+menu system did on every click. DeadlineTimer keeps one daemon thread per
+timer that sleeps until the current deadline; start() moves the deadline
+and cancel() clears it, so re-arming on each keypress creates nothing.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineTimer:
+    """One-shot timer that can be re-armed and cancelled without new threads"""
+
+    def __init__(self, callback: Callable[[], None], name: str = "DeadlineTimer"):
+        self._callback = callback
+        self._name = name
+        self._deadline: Optional[float] = None  # time.monotonic() to fire at, or None
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def active(self) -> bool:
+        """True while a callback is scheduled"""
+        return self._deadline is not None
+
+    def start(self, delay: float):
+        """(Re)schedule the callback delay seconds from now"""
+        with self._cond:
+            self._deadline = time.monotonic() + delay
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name=self._name, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def cancel(self):
+        """Drop the scheduled callback, if any"""
+        with self._cond:
+            self._deadline = None
+            self._cond.notify()
+
+    def _worker(self):
+        """Timer thread - sleeps until the deadline, re-checking whenever it moves"""
+        cond = self._cond
+        with cond:
+            while True:
+                deadline = self._deadline
+                if deadline is None:
+                    cond.wait()
+                    continue
+
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    cond.wait(remaining)
+                    continue
+
+                self._deadline = None
+                # Run the callback unlocked so it may re-arm or cancel the timer
+                cond.release()
+                try:
+                    self._callback()
+                except Exception:
+                    logger.exception("%s callback failed", self._name)
+                finally:
+                    cond.acquire()
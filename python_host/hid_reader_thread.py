@@ -5,19 +5,48 @@ Runs HID communication in a background thread while Qt UI runs on main thread.
 """
 
 from PyQt6.QtCore import QThread, pyqtSignal
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from importlib import metadata
 import hid
 import logging
+import threading
 import time
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# cython-hidapi releases the GIL around hid_enumerate from this version on;
+# older builds freeze every Python thread (including the Qt UI) while it runs
+HIDAPI_MIN_VERSION = (0, 14, 0)
+ENUMERATE_TIMEOUT_S = 10.0
+
+# Single worker so a hung enumerate can't pile up threads
+_enumerate_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hid-enumerate")
+
+
+def _check_hidapi_version():
+    """Warn if the installed hidapi binding holds the GIL during enumerate"""
+    try:
+        version = metadata.version("hidapi")
+    except metadata.PackageNotFoundError:
+        return
+
+    parts = []
+    for part in version.split(".")[:3]:
+        digits = "".join(c for c in part if c.isdigit())
+        parts.append(int(digits) if digits else 0)
+
+    if tuple(parts) < HIDAPI_MIN_VERSION:
+        logger.warning("hidapi %s holds the GIL during enumerate - upgrade to >= %s to avoid UI freezes",
+                       version, ".".join(map(str, HIDAPI_MIN_VERSION)))
+
 
 class HIDReaderThread(QThread):
     """Background thread for reading HID events from keyboard"""
 
     # Signals for HID events
     event_received = pyqtSignal(int, int, int)  # event_type, encoder_id, value
+    rotation_received = pyqtSignal(int, int, int)  # event_type (CW/CCW), encoder_id, count
     connection_lost = pyqtSignal()
     connection_established = pyqtSignal()
     error_occurred = pyqtSignal(str)
@@ -30,6 +59,11 @@ class HIDReaderThread(QThread):
     EVENT_LONG_PRESS = 0x05  # Long press
     EVENT_DOUBLE_CLICK = 0x06 # Double click
 
+    EVENT_MARKER = 0xFD      # First byte of encoder event reports
+    REPORT_SIZE = 32         # QMK Raw HID report size
+    READ_TIMEOUT_MS = 500    # hid_read_timeout returns as soon as a report arrives
+    COALESCE_MS = 5          # Window for merging consecutive rotation events
+
     def __init__(self, vendor_id: int, product_id: int, usage_page: int, usage: int):
         super().__init__()
 
@@ -40,47 +74,88 @@ class HIDReaderThread(QThread):
 
         self.device: Optional[hid.device] = None
         self.running = False
+        self._stop_event = threading.Event()
         self._reconnect_attempts = 0
-        self._max_reconnect_attempts = 5
+        # Serializes writes from other threads with closing the device
+        self._device_lock = threading.Lock()
+        self._cached_path: Optional[bytes] = None  # Device path from last successful enumerate
+
+        # Report handlers indexed by first byte; None = ignore
+        self._dispatch: List[Optional[Callable[[list], None]]] = [None] * 256
+        self._dispatch[self.EVENT_MARKER] = self._process_hid_data
+
+        # Pending rotation counts keyed by (event_type, encoder_id)
+        self._pending: Dict[Tuple[int, int], int] = {}
+        self._pending_since = 0.0
+
+        _check_hidapi_version()
 
     def run(self):
         """Main thread loop - reads HID events"""
         self.running = True
+        self._stop_event.clear()
 
         while self.running:
             try:
                 # Try to connect if not connected
                 if not self.device:
                     if not self._connect():
-                        time.sleep(2)  # Wait before retry
+                        # Exponential backoff: 1s, 2s, 4s, ... capped at 30s
+                        self._stop_event.wait(min(30, 2 ** max(0, self._reconnect_attempts - 1)))
                         continue
 
-                # Read HID data (blocking with timeout)
-                data = self.device.read(64, timeout_ms=100)
+                # Read HID data (blocking; the timeout only bounds shutdown latency,
+                # or the coalescing window while rotations are pending)
+                timeout_ms = self.COALESCE_MS if self._pending else self.READ_TIMEOUT_MS
+                data = self.device.read(self.REPORT_SIZE, timeout_ms=timeout_ms)
 
+                # Route by marker byte; non-event reports hit a None slot
                 if data:
-                    self._process_hid_data(data)
-                    self._reconnect_attempts = 0  # Reset on successful read
+                    handler = self._dispatch[data[0]]
+                    if handler is not None:
+                        handler(data)
+
+                # Flush rotations once the knob goes quiet or the window expires
+                if self._pending and (not data or
+                                      time.monotonic() - self._pending_since >= self.COALESCE_MS / 1000):
+                    self._flush_pending()
 
             except Exception as e:
-                logger.error(f"HID read error: {e}")
+                logger.error("HID read error: %s", e)
                 self._handle_connection_error()
-                time.sleep(1)
+                self._stop_event.wait(1)
 
         # Cleanup
+        self._pending.clear()
         self._disconnect()
 
     def stop(self):
-        """Stop the thread"""
+        """Stop the thread
+
+        Back-off waits wake immediately; a read in progress returns within
+        READ_TIMEOUT_MS since hidapi offers no handle to wait on.
+        """
         self.running = False
+        self._stop_event.set()
 
     def _connect(self) -> bool:
         """Connect to HID device"""
         try:
-            logger.info(f"Connecting to HID device (VID: 0x{self.vendor_id:04X}, PID: 0x{self.product_id:04X})")
+            # Reuse the last known path - hid.enumerate can take seconds on Windows
+            if self._cached_path:
+                try:
+                    self.device = hid.device()
+                    self.device.open_path(self._cached_path)
+                    self.device.set_nonblocking(False)
+                    return self._on_connected()
+                except Exception:
+                    self.device = None
+                    self._cached_path = None
+
+            logger.info("Connecting to HID device (VID: 0x%04X, PID: 0x%04X)", self.vendor_id, self.product_id)
 
             # Find device
-            devices = hid.enumerate(self.vendor_id, self.product_id)
+            devices = self._enumerate()
             target_device = None
 
             for dev in devices:
@@ -98,27 +173,46 @@ class HIDReaderThread(QThread):
             self.device = hid.device()
             self.device.open_path(target_device['path'])
             self.device.set_nonblocking(False)
+            self._cached_path = target_device['path']
 
-            logger.info("HID device connected successfully")
-            self.connection_established.emit()
-            self._reconnect_attempts = 0
-            return True
+            return self._on_connected()
 
         except Exception as e:
-            logger.error(f"HID connection error: {e}")
+            logger.error("HID connection error: %s", e)
             self.device = None
             self._reconnect_attempts += 1
             return False
 
+    def _enumerate(self) -> List[dict]:
+        """Enumerate matching devices with a hard timeout
+
+        This is the only place the Qt app calls hid.enumerate, and it always
+        runs off the GUI thread.
+        """
+        future = _enumerate_pool.submit(hid.enumerate, self.vendor_id, self.product_id)
+        try:
+            return future.result(timeout=ENUMERATE_TIMEOUT_S)
+        except FutureTimeoutError:
+            logger.warning("hid.enumerate did not return within %.0fs", ENUMERATE_TIMEOUT_S)
+            return []
+
+    def _on_connected(self) -> bool:
+        """Finish a successful connection"""
+        logger.info("HID device connected successfully")
+        self.connection_established.emit()
+        self._reconnect_attempts = 0
+        return True
+
     def _disconnect(self):
         """Disconnect from HID device"""
-        if self.device:
-            try:
-                self.device.close()
-                logger.info("HID device disconnected")
-            except:
-                pass
-            self.device = None
+        with self._device_lock:
+            if self.device:
+                try:
+                    self.device.close()
+                    logger.info("HID device disconnected")
+                except:
+                    pass
+                self.device = None
 
     def _handle_connection_error(self):
         """Handle connection loss"""
@@ -126,29 +220,50 @@ class HIDReaderThread(QThread):
         self._disconnect()
         self.connection_lost.emit()
 
-    def _process_hid_data(self, data: bytes):
+    def _process_hid_data(self, data: list):
         """Process incoming HID data packet"""
+        # hidapi hands back a fresh list of ints, so index it directly;
+        # the dispatch table already matched the marker byte
         if len(data) < 4:
             return
-
-        # Check for event marker
-        if data[0] != 0xFD:
-            return
-
         event_type = data[1]
         encoder_id = data[2]
         value = data[3]
 
+        # Accumulate rotations; the run loop emits them as one event
+        if event_type == self.EVENT_CW or event_type == self.EVENT_CCW:
+            key = (event_type, encoder_id)
+            if not self._pending:
+                self._pending_since = time.monotonic()
+            self._pending[key] = self._pending.get(key, 0) + 1
+            return
+
+        # Keep ordering: pending rotations happened before this event
+        if self._pending:
+            self._flush_pending()
+
         # Emit signal with event data
         self.event_received.emit(event_type, encoder_id, value)
 
+    def _flush_pending(self):
+        """Emit accumulated rotation counts"""
+        for (event_type, encoder_id), count in self._pending.items():
+            self.rotation_received.emit(event_type, encoder_id, count)
+        self._pending.clear()
+
     def send_hid_data(self, data: bytes):
-        """Send data to HID device (called from main thread via queued connection)"""
-        if self.device:
+        """Send data to HID device (safe to call from any thread)
+
+        hidapi allows a write while another thread is blocked in read, so the
+        write goes out immediately; the lock only keeps it off a closing device.
+        """
+        with self._device_lock:
+            if not self.device:
+                return
             try:
                 self.device.write(data)
             except Exception as e:
-                logger.error(f"HID write error: {e}")
+                logger.error("HID write error: %s", e)
 
 
 if __name__ == "__main__":
@@ -171,6 +286,9 @@ if __name__ == "__main__":
     def on_event(event_type, encoder_id, value):
         print(f"Event: type={event_type}, encoder={encoder_id}, value={value}")
 
+    def on_rotation(event_type, encoder_id, count):
+        print(f"Rotation: type={event_type}, encoder={encoder_id}, count={count}")
+
     def on_connected():
         print("Connected!")
 
@@ -178,6 +296,7 @@ if __name__ == "__main__":
         print("Disconnected!")
 
     reader.event_received.connect(on_event)
+    reader.rotation_received.connect(on_rotation)
     reader.connection_established.connect(on_connected)
     reader.connection_lost.connect(on_disconnected)
 
@@ -13,26 +13,28 @@ Integrates:
 import sys
 import time
 import threading
+import atexit
 import logging
+import logging.handlers
+import queue
 import json
 import os
-import importlib
-import pkgutil
-from typing import Optional, List
+from functools import partial
+from typing import Callable, Optional, List
 from pathlib import Path
 import subprocess
 
 # Import our modules
 from menu_system import MenuStateMachine, MenuMode
 from mode_handlers import create_handlers
+from plugin_loader import import_plugin
 from windows_api import SystemAPI
-from overlay_ui import UIManager
 from voicemeeter_api import VoicemeeterController
 from led_feedback import LEDFeedback
 from tray_icon import TrayIcon
 
-# Use Tkinter overlay (Qt has threading issues on Windows - requires main thread)
-from overlay_enhanced import EnhancedUIManager
+# Use Tkinter overlay (Qt has threading issues on Windows - requires main thread).
+# The overlay modules are imported in KeychronApp.__init__, only for the UI in use.
 UI_BACKEND = "Tkinter"
 
 # Qt overlay available but disabled - requires app restructuring to run on main thread
@@ -45,14 +47,19 @@ import hid
 # LOGGING SETUP
 # ============================================================================
 
+# Directory of this script; themes and logs live beside it
+_HERE = Path(__file__).resolve().parent
+
 # Configure logging - handle both console and background execution
 log_handlers = []
 
 # Add file handler for pythonw.exe (no console) scenarios
-log_dir = Path(__file__).parent / "logs"
+log_dir = _HERE / "logs"
 log_dir.mkdir(exist_ok=True)
 log_file = log_dir / "keychron_app.log"
-log_handlers.append(logging.FileHandler(log_file, encoding='utf-8'))
+# Rotate at 1 MB so a long-running session can't grow the log without bound
+log_handlers.append(logging.handlers.RotatingFileHandler(
+    log_file, maxBytes=1 << 20, backupCount=3, encoding='utf-8'))
 
 # Add console handler if stdout is available (python.exe)
 if sys.stdout is not None:
@@ -61,10 +68,20 @@ if sys.stdout is not None:
     except:
         pass  # Ignore if console not available
 
+log_formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s')
+for handler in log_handlers:
+    handler.setFormatter(log_formatter)
+
+# Callers only append to a queue; a listener thread does the file/console
+# writes, so logging from the HID thread never waits on the handler locks
+log_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(log_queue, *log_handlers, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)  # Flush queued records on exit
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(message)s',
-    handlers=log_handlers
+    handlers=[logging.handlers.QueueHandler(log_queue)]
 )
 logger = logging.getLogger("KeychronApp")
 
@@ -77,7 +94,7 @@ DEFAULT_CONFIG = {
     "vendor_id": 0x3434,   # Keychron
     "product_id": 0x0311,  # V1 ANSI Encoder
     "usage_page": 0xFF60,
-    "timeout_ms": 100,
+    "timeout_ms": 1000,    # HID read timeout; reports wake the reader immediately
     "reconnect_interval": 2.0,
     "max_reconnect_attempts": 30,
     "ui_theme": "DARK",
@@ -128,22 +145,19 @@ class PluginManager:
 
         logger.info(f"Loading plugins from {self.plugins_dir}...")
 
-        # Add plugins dir to path so we can import
-        sys.path.append(os.path.abspath(self.plugins_dir))
-
-        for _, name, _ in pkgutil.iter_modules([self.plugins_dir]):
+        for path in sorted(Path(self.plugins_dir).glob('*.py')):
+            name = path.stem
             try:
-                module = importlib.import_module(name)
+                module = import_plugin(path)
 
                 # Load commands
                 if hasattr(module, 'get_commands'):
                     commands = module.get_commands()
+                    state_machine.commands.register_many(
+                        (cmd['name'], cmd.get('description', ''), cmd['callback'])
+                        for cmd in commands
+                    )
                     for cmd in commands:
-                        state_machine.commands.register(
-                            cmd['name'],
-                            cmd.get('description', ''),
-                            cmd['callback']
-                        )
                         logger.info(f"  + Registered plugin command: {cmd['name']}")
 
                 # Load mode handlers
@@ -174,6 +188,9 @@ def launch_playnite():
 # KEYCHRON APPLICATION
 # ============================================================================
 
+# Display dict keys that are instructions for the app, not text to show
+UI_CONTROL_KEYS = frozenset({'icons', 'progress', 'set_theme', 'preview_theme', 'set_theme_color', 'save_theme'})
+
 class KeychronApp:
     """Main application - integrates HID, state machine, and UI"""
 
@@ -188,12 +205,22 @@ class KeychronApp:
 
         # UI - use enhanced or basic
         if config['use_enhanced_ui']:
+            from overlay_enhanced import EnhancedUIManager
             self.ui = EnhancedUIManager(theme=config['ui_theme'])
         else:
+            from overlay_ui import UIManager
             self.ui = UIManager()
 
+        # Optional UI methods, resolved once (None if this UI lacks them)
+        self._ui_set_theme = getattr(self.ui, 'set_theme', None)
+        self._ui_update_theme_color = getattr(self.ui, 'update_theme_color', None)
+        self._ui_save_theme = getattr(self.ui, 'save_theme', None)
+        self._ui_show_menu = getattr(self.ui, 'show_menu', None)
+        self._ui_hide_menu = getattr(self.ui, 'hide_menu', None)
+
         # LED feedback (will be initialized after HID connection)
         self.led: Optional[LEDFeedback] = None
+        self._flash_led: Optional[Callable[[str], None]] = None  # Bound led.flash_event, or None
         self.led_enabled = config['led_feedback']
 
         # Tray icon
@@ -201,16 +228,23 @@ class KeychronApp:
 
         self.device: Optional[hid.device] = None
         self.running = threading.Event()
+        self._shutdown = threading.Event()  # Set by stop(); the main thread waits on it
         self.is_pressed = False
         self.was_rotated_while_pressed = False
         self.ignore_next_release = False  # Prevents release after double-tap from triggering command
 
         # Threads
         self.hid_thread: Optional[threading.Thread] = None
-        self.timeout_thread: Optional[threading.Thread] = None
 
-        # Track command sequence for rotation direction
-        self.last_command_index = 0
+        # Event type -> handler, looked up once per HID packet
+        self._event_handlers = {
+            EVT_ENCODER_CW: partial(self._handle_rotation, True),
+            EVT_ENCODER_CCW: partial(self._handle_rotation, False),
+            EVT_ENCODER_PRESS: self._handle_press,
+            EVT_ENCODER_RELEASE: self._handle_release,
+            EVT_ENCODER_LONG: self._handle_long_press,
+            EVT_ENCODER_DOUBLE: self._handle_double_tap,
+        }
 
     def setup(self):
         """Initialize all components"""
@@ -270,42 +304,24 @@ class KeychronApp:
     def _register_commands(self):
         """Register built-in commands"""
         # Always register System Volume Control
-        self.state_machine.commands.register(
-            "Volume Control",
-            "Adjust system volume and mute",
-            self._enter_volume_mode
-        )
+        commands = [
+            ("Volume Control", "Adjust system volume and mute", self._enter_volume_mode),
+        ]
 
         # Register Voicemeeter if available
         if self.vm.is_available():
-            self.state_machine.commands.register(
-                "Voicemeeter Control",
-                "Audio routing and gain control",
-                self._enter_voicemeeter_menu
+            commands.append(
+                ("Voicemeeter Control", "Audio routing and gain control", self._enter_voicemeeter_menu)
             )
 
-        self.state_machine.commands.register(
-            "Media Controls",
-            "Play/pause, next/prev track",
-            self._enter_media_mode
-        )
-
-        self.state_machine.commands.register(
-            "Theme Selector",
-            "Change UI color theme",
-            self._enter_theme_menu
-        )
-        
-        self.state_machine.commands.register(
-            "Window Manager",
-            "Cycle and snap windows",
-            self._enter_window_menu_mode
-        )
-        self.state_machine.commands.register(
-            "Launch Playnite",
-            "Open Playnite fullscreen",
-            launch_playnite
-        )
+        commands += [
+            ("Media Controls", "Play/pause, next/prev track", self._enter_media_mode),
+            ("Theme Selector", "Change UI color theme", self._enter_theme_menu),
+            ("Window Manager", "Cycle and snap windows", self._enter_window_menu_mode),
+            ("Launch Playnite", "Open Playnite fullscreen", launch_playnite),
+        ]
+
+        self.state_machine.commands.register_many(commands)
 
     def _enter_theme_menu(self):
         """Enter theme selection mode"""
@@ -339,40 +355,44 @@ class KeychronApp:
 
     def _on_ui_update(self, display: dict):
         """Callback: Update UI overlay"""
-        # Extract special control keys
-        icons = display.pop('icons', None)
-        progress = display.pop('progress', None)
-        theme_name = display.pop('set_theme', None)
-        preview_theme = display.pop('preview_theme', None)
-        theme_colors = display.pop('set_theme_color', None)
+        # Read special control keys without mutating the handler's dict
+        icons = display.get('icons')
+        progress = display.get('progress')
+        theme_name = display.get('set_theme')
+        preview_theme = display.get('preview_theme')
+        theme_colors = display.get('set_theme_color')
+        save_request = display.get('save_theme')
 
         # Apply theme change (SAVE)
-        if theme_name and hasattr(self.ui, 'set_theme'):
-            self.ui.set_theme(theme_name)
+        if theme_name and self._ui_set_theme is not None:
+            self._ui_set_theme(theme_name)
             # Save to config
             self.config['ui_theme'] = theme_name
             self.save_config()
 
         # Apply theme preview (NO SAVE)
-        if preview_theme and hasattr(self.ui, 'set_theme'):
-            self.ui.set_theme(preview_theme)
+        if preview_theme and self._ui_set_theme is not None:
+            self._ui_set_theme(preview_theme)
             
         # Apply specific color updates
-        if theme_colors and hasattr(self.ui, 'update_theme_color'):
-            self.ui.update_theme_color(theme_colors)
+        if theme_colors and self._ui_update_theme_color is not None:
+            self._ui_update_theme_color(theme_colors)
 
         # Persistence: save theme if requested
-        save_request = display.pop('save_theme', None)
-        if save_request and hasattr(self.ui, 'save_theme'):
-            self.ui.save_theme(save_request)
+        if save_request and self._ui_save_theme is not None:
+            self._ui_save_theme(save_request)
 
         # Show menu with enhanced data
-        if hasattr(self.ui, 'show_menu'):
+        show_menu = self._ui_show_menu
+        if show_menu is not None:
+            # Most updates carry no control keys and are passed through as is
+            if not UI_CONTROL_KEYS.isdisjoint(display):
+                display = {k: v for k, v in display.items() if k not in UI_CONTROL_KEYS}
             if icons or progress is not None:
                 # Enhanced UI supports icons and progress
-                self.ui.show_menu(display, progress=progress, icons=icons)
+                show_menu(display, progress=progress, icons=icons)
             else:
-                self.ui.show_menu(display)
+                show_menu(display)
 
     def _on_notification(self, message: str, duration: int):
         """Callback: Show notification"""
@@ -380,8 +400,8 @@ class KeychronApp:
 
     def _on_ui_hide(self):
         """Callback: Hide UI overlay"""
-        if hasattr(self.ui, 'hide_menu'):
-            self.ui.hide_menu()
+        if self._ui_hide_menu is not None:
+            self._ui_hide_menu()
 
     def connect_hid(self) -> bool:
         """Connect to keyboard HID device with retries"""
@@ -393,7 +413,11 @@ class KeychronApp:
         
         attempts = 0
         max_attempts = self.config['max_reconnect_attempts']
-        
+        # Back off from 100 ms up to reconnect_interval: during boot the keyboard
+        # usually enumerates within the first few polls
+        max_delay = self.config['reconnect_interval']
+        delay = min(0.1, max_delay)
+
         while attempts < max_attempts and self.running.is_set():
             try:
                 # Find Raw HID interface
@@ -412,25 +436,29 @@ class KeychronApp:
 
                     manufacturer = self.device.get_manufacturer_string()
                     product = self.device.get_product_string()
-                    logger.info(f"Connected to: {manufacturer} {product} (VID: 0x{vid:04X}, PID: 0x{pid:04X})")
+                    logger.info("Connected to: %s %s (VID: 0x%04X, PID: 0x%04X)", manufacturer, product, vid, pid)
 
                     # Initialize LED feedback
                     if self.led_enabled:
                         self.led = LEDFeedback(self.device)
                         self.led.set_mode_color('NORMAL')
                         self.state_machine.led = self.led
+                        self._flash_led = self.led.flash_event
                         logger.info("LED feedback enabled")
 
                     return True
                 
                 attempts += 1
                 if attempts % 5 == 0:
-                    logger.info(f"Waiting for device... (Attempt {attempts}/{max_attempts})")
-                time.sleep(self.config['reconnect_interval'])
+                    logger.info("Waiting for device... (Attempt %d/%d)", attempts, max_attempts)
 
             except Exception as e:
-                logger.debug(f"Connection attempt failed: {e}")
-                time.sleep(self.config['reconnect_interval'])
+                logger.debug("Connection attempt failed: %s", e)
+
+            # Wait on the shutdown event so stop() cuts the backoff short
+            if self._shutdown.wait(delay):
+                break
+            delay = min(delay * 2, max_delay)
 
         logger.error("Could not find Keychron V1 ANSI Encoder device.")
         return False
@@ -441,23 +469,17 @@ class KeychronApp:
 
         while self.running.is_set():
             try:
-                # Blocking read with timeout
+                # Blocking read; the kernel wakes us when a report arrives, the
+                # timeout only bounds how long stop() waits for this thread
                 data = self.device.read(32, timeout_ms=self.config['timeout_ms'])
-                if not data or len(data) == 0:
-                    continue
-
-                # Parse event
-                if data[0] == HID_EVT_MARKER:
-                    event_type = data[1]
-                    encoder_id = data[2]
-                    value = data[3]
-
+                # hidapi returns a fresh list of ints; index it directly
+                if len(data) >= 4 and data[0] == HID_EVT_MARKER:
                     # Route to state machine
-                    self._handle_encoder_event(event_type, value)
+                    self._handle_encoder_event(data[1], data[3])
 
             except Exception as e:
                 if self.running.is_set():
-                    logger.error(f"HID read error: {e}")
+                    logger.error("HID read error: %s", e)
                     # Simple reconnection logic could go here
                 break
 
@@ -465,92 +487,82 @@ class KeychronApp:
 
     def _handle_encoder_event(self, event_type: int, value: int):
         """Route encoder events to state machine"""
-
-        # Debug logging
-        # logger.info(f"Event: {event_type}, Pressed: {self.is_pressed}")
-
-        # Get dynamic item count from state machine's command registry
-        num_items = self.state_machine.commands.count() if hasattr(self.state_machine, 'commands') else 4
-
-        if event_type == EVT_ENCODER_CW:
-            # Quick volume control: Press + Rotate = Instant volume adjustment
-            if self.is_pressed:
-                self.was_rotated_while_pressed = True
-
-                # Hide any open menu UI (from previous browsing)
-                if self.state_machine.state.menu_mode == MenuMode.NORMAL:
-                    self._on_ui_hide()
-
-                self.api.volume.adjust_volume(2)
-                vol = self.api.volume.get_volume()
-                self.ui.show_notification(f"Volume: {vol}%", 500)
-                if self.led: self.led.flash_event('rotate_cw')
-                return
-
-            # Clockwise rotation (Normal)
-            next_index = (self.last_command_index + 1) % num_items
-            self.state_machine.handle_rotation(next_index)
-            self.last_command_index = next_index
-            if self.led: self.led.flash_event('rotate_cw')
-
-        elif event_type == EVT_ENCODER_CCW:
-            # Quick volume control: Press + Rotate = Instant volume adjustment
-            if self.is_pressed:
-                self.was_rotated_while_pressed = True
-
-                # Hide any open menu UI (from previous browsing)
-                if self.state_machine.state.menu_mode == MenuMode.NORMAL:
-                    self._on_ui_hide()
-
-                self.api.volume.adjust_volume(-2)
-                vol = self.api.volume.get_volume()
-                self.ui.show_notification(f"Volume: {vol}%", 500)
-                if self.led: self.led.flash_event('rotate_ccw')
-                return
-
-            # Counter-clockwise rotation (Normal)
-            next_index = (self.last_command_index - 1) % num_items
-            self.state_machine.handle_rotation(next_index)
-            self.last_command_index = next_index
-            if self.led: self.led.flash_event('rotate_ccw')
-
-        elif event_type == EVT_ENCODER_PRESS:
-            self.is_pressed = True
-            self.was_rotated_while_pressed = False
-            if self.led: self.led.flash_event('press')
-
-        elif event_type == EVT_ENCODER_RELEASE:
-            self.is_pressed = False
-            # Skip if this release follows a double-tap (which already exited the menu)
-            if self.ignore_next_release:
-                self.ignore_next_release = False
-                return
-            # If we were doing quick volume adjustment, hide the notification immediately
-            if self.was_rotated_while_pressed and self.state_machine.state.menu_mode == MenuMode.NORMAL:
+        handler = self._event_handlers.get(event_type)
+        if handler:
+            handler()
+
+    def _refresh_volume_handler(self):
+        """Re-sync the volume menu after a quick-volume change while it is open"""
+        if self.state_machine.state.menu_mode == MenuMode.VOLUME:
+            handler = self.state_machine.mode_handlers[MenuMode.VOLUME.value]
+            if handler:
+                handler.refresh()
+
+    def _handle_rotation(self, clockwise: bool):
+        """Handle encoder rotation"""
+        led_event = 'rotate_cw' if clockwise else 'rotate_ccw'
+
+        # Quick volume control: Press + Rotate = Instant volume adjustment
+        if self.is_pressed:
+            self.was_rotated_while_pressed = True
+
+            # Hide any open menu UI (from previous browsing)
+            if self.state_machine.state.menu_mode == MenuMode.NORMAL:
                 self._on_ui_hide()
-            # Only execute click if we didn't use the press for rotation
-            elif not self.was_rotated_while_pressed:
-                self.state_machine.handle_press()
-
-        elif event_type == EVT_ENCODER_LONG:
-            self.is_pressed = False
-            self.was_rotated_while_pressed = False
-            self.state_machine.handle_long_press()
-
-        elif event_type == EVT_ENCODER_DOUBLE:
-            self.is_pressed = False
-            self.was_rotated_while_pressed = False
-            self.ignore_next_release = True  # Prevent subsequent release from executing command
-            # Ensure we reset click count in state machine to avoid conflict
-            self.state_machine.state.click_count = 0
-            self.state_machine.handle_double_tap()
-
-    def timeout_check_loop(self):
-        """Check for menu timeout in background"""
-        while self.running.is_set():
-            time.sleep(0.5)
-            if self.state_machine.check_menu_timeout():
-                self.state_machine.exit_menu_mode()
+
+            self.api.volume.adjust_volume(2 if clockwise else -2)
+            vol = self.api.volume.get_volume()
+            self._refresh_volume_handler()
+            self.ui.show_notification(f"Volume: {vol}%", 500)
+            flash_led = self._flash_led
+            if flash_led: flash_led(led_event)
+            return
+
+        # Normal rotation
+        self.state_machine.handle_rotation_delta(1 if clockwise else -1)
+        flash_led = self._flash_led
+        if flash_led: flash_led(led_event)
+
+    def _handle_press(self):
+        """Handle encoder press"""
+        self.is_pressed = True
+        self.was_rotated_while_pressed = False
+        flash_led = self._flash_led
+        if flash_led: flash_led('press')
+
+    def _handle_release(self):
+        """Handle encoder release"""
+        self.is_pressed = False
+        # Skip if this release follows a double-tap (which already exited the menu)
+        if self.ignore_next_release:
+            self.ignore_next_release = False
+            return
+        # If we were doing quick volume adjustment, hide the notification immediately
+        if self.was_rotated_while_pressed and self.state_machine.state.menu_mode == MenuMode.NORMAL:
+            self._on_ui_hide()
+        # Only execute click if we didn't use the press for rotation
+        elif not self.was_rotated_while_pressed:
+            self.state_machine.handle_press()
+
+    def _handle_long_press(self):
+        """Handle encoder long-press"""
+        self.is_pressed = False
+        self.was_rotated_while_pressed = False
+        self.state_machine.handle_long_press()
+
+    def _handle_double_tap(self):
+        """Handle encoder double-tap"""
+        self.is_pressed = False
+        self.was_rotated_while_pressed = False
+        self.ignore_next_release = True  # Prevent subsequent release from executing command
+        # Ensure we reset click count in state machine to avoid conflict
+        self.state_machine.state.click_count = 0
+        self.state_machine.handle_double_tap()
+
+    def _check_timeout(self):
+        """Exit the menu after inactivity (runs on the main thread)"""
+        if self.state_machine.check_menu_timeout():
+            self.state_machine.exit_menu_mode()
 
     def run(self):
         """Main run loop"""
@@ -569,10 +581,6 @@ class KeychronApp:
         self.hid_thread = threading.Thread(target=self.hid_reader_loop, daemon=True)
         self.hid_thread.start()
 
-        # Start timeout checker thread
-        self.timeout_thread = threading.Thread(target=self.timeout_check_loop, daemon=True)
-        self.timeout_thread.start()
-
         # Show startup notification
         msg = "Keychron + Voicemeeter Active" if self.vm.is_available() else "Keychron Active"
         self.ui.show_notification(msg, 2000)
@@ -580,10 +588,12 @@ class KeychronApp:
         logger.info("System ready! Rotate or press encoder to interact.")
         logger.info("Press Ctrl+C to exit.")
 
-        # Main loop - just keep alive
+        # Park the main thread until stop(), waking every 500ms to check the
+        # menu timeout (this also lets Ctrl+C through - a lock wait can't be
+        # interrupted on Windows)
         try:
-            while self.running.is_set():
-                time.sleep(0.1)
+            while not self._shutdown.wait(0.5):
+                self._check_timeout()
         except KeyboardInterrupt:
             logger.info("Shutting down request received...")
             self.stop()
@@ -593,11 +603,21 @@ class KeychronApp:
     def stop(self):
         """Stop application"""
         self.running.clear()
+        self._shutdown.set()
 
         # Stop tray icon
         if hasattr(self, 'tray_icon') and self.tray_icon:
             self.tray_icon.stop()
 
+        # Let the reader leave its pending read before closing the device
+        # (hidapi handles must not be closed under a read in progress)
+        if self.hid_thread and self.hid_thread is not threading.current_thread():
+            self.hid_thread.join(timeout=self.config['timeout_ms'] / 1000 + 0.5)
+
+        # Write any queued LED updates, then stop the LED writer
+        if self.led:
+            self.led.close()
+
         # Close HID device
         if self.device:
             try:
@@ -628,7 +648,7 @@ def main():
     parser = argparse.ArgumentParser(description='Keychron V1 Menu System')
     # Load available themes from themes.json
     available_themes = ['DARK', 'LIGHT', 'CYBER']  # defaults
-    themes_path = Path(__file__).parent / 'themes.json'
+    themes_path = _HERE / 'themes.json'
     if themes_path.exists():
         try:
             with open(themes_path, 'r') as f:
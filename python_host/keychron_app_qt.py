@@ -5,26 +5,36 @@ Properly restructured with Qt on main thread and HID in worker thread.
 """
 
 import sys
+import atexit
 import logging
+import logging.handlers
+import queue
 import json
 import os
-import importlib
-import pkgutil
-from typing import Optional, List
+import time
+from functools import partial
+from typing import TYPE_CHECKING, Optional, List
 from pathlib import Path
 import subprocess
 
-from PyQt6.QtCore import QObject, pyqtSlot, QTimer
-from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot, QTimer
 
 # Import our modules
 from menu_system import MenuStateMachine, MenuMode
 from mode_handlers import create_handlers
+from plugin_loader import import_plugin
 from windows_api import SystemAPI
 from voicemeeter_api import VoicemeeterController
 from tray_icon import TrayIcon
 from hid_reader_thread import HIDReaderThread
-from overlay_qt import EnhancedUIManager
+
+# QtWidgets/QtGui (QApplication, overlay_qt) are imported where first used,
+# so argument errors and --help don't pay for loading them
+if TYPE_CHECKING:
+    from PyQt6.QtWidgets import QApplication
+
+# Directory of this script; config, themes, plugins and logs live beside it
+_HERE = Path(__file__).resolve().parent
 
 # ============================================================================
 # LOGGING SETUP
@@ -33,11 +43,12 @@ from overlay_qt import EnhancedUIManager
 log_handlers = []
 
 # Always log to file
-log_dir = Path(__file__).parent / 'logs'
+log_dir = _HERE / 'logs'
 log_dir.mkdir(exist_ok=True)
 log_file = log_dir / 'keychron_app.log'
 
-file_handler = logging.FileHandler(log_file)
+# Rotate at 1 MB so a long-running session can't grow the log without bound
+file_handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=1 << 20, backupCount=3)
 file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
 log_handlers.append(file_handler)
 
@@ -47,9 +58,16 @@ if sys.executable.endswith('python.exe'):
     console_handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
     log_handlers.append(console_handler)
 
+# Callers only append to a queue; a listener thread does the file/console
+# writes, so logging from the HID thread never waits on the handler locks
+log_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(log_queue, *log_handlers, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)  # Flush queued records on exit
+
 logging.basicConfig(
     level=logging.INFO,
-    handlers=log_handlers
+    handlers=[logging.handlers.QueueHandler(log_queue)]
 )
 
 logger = logging.getLogger(__name__)
@@ -67,36 +85,34 @@ class PluginManager:
 
     def load_plugins(self, state_machine):
         """Load all plugins from plugins directory"""
-        plugin_dir = Path(__file__).parent / 'plugins'
+        plugin_dir = _HERE / 'plugins'
         if not plugin_dir.exists():
             return
 
-        sys.path.insert(0, str(plugin_dir))
-
-        for finder, name, ispkg in pkgutil.iter_modules([str(plugin_dir)]):
+        for path in sorted(plugin_dir.glob('*.py')):
+            name = path.stem
             try:
-                logger.info(f"Loading plugin: {name}")
-                module = importlib.import_module(name)
+                logger.info("Loading plugin: %s", name)
+                module = import_plugin(path)
 
                 if hasattr(module, 'get_commands'):
                     commands = module.get_commands()
+                    state_machine.commands.register_many(
+                        (cmd['name'], cmd['description'], cmd['callback'])
+                        for cmd in commands
+                    )
                     for cmd in commands:
-                        state_machine.commands.register(
-                            cmd['name'],
-                            cmd['description'],
-                            cmd['callback']
-                        )
-                        logger.info(f"  + Registered command: {cmd['name']}")
+                        logger.info("  + Registered command: %s", cmd['name'])
 
                 if hasattr(module, 'get_mode_handlers'):
                     handlers = module.get_mode_handlers(state_machine)
                     self.plugin_handlers.update(handlers)
                     for mode_name in handlers.keys():
-                        logger.info(f"  + Registered plugin mode handler: {mode_name}")
+                        logger.info("  + Registered plugin mode handler: %s", mode_name)
 
                 self.plugins.append(module)
             except Exception as e:
-                logger.error(f"Failed to load plugin {name}: {e}")
+                logger.error("Failed to load plugin %s: %s", name, e)
 
 
 # ============================================================================
@@ -106,11 +122,35 @@ class PluginManager:
 class KeychronApp(QObject):
     """Main application - integrates HID, state machine, and UI using Qt"""
 
-    def __init__(self, config, app: QApplication):
+    # Main menu entries: (name, description, mode entered on press)
+    BUILTIN_COMMANDS = (
+        ("Media Controls", "Play/Pause, Next/Prev", MenuMode.MEDIA),
+        ("Volume", "System volume control", MenuMode.VOLUME),
+        ("Window Management", "Cycle, Snap, Desktop", MenuMode.WINDOW_MENU),
+        ("Theme Settings", "UI customization", MenuMode.THEME_MENU),
+    )
+    VOICEMEETER_COMMAND = ("Voicemeeter", "Audio routing", MenuMode.VOICEMEETER_MENU)
+
+    # Emitted when the menu timeout starts running; may fire off the GUI thread
+    menu_timer_armed = pyqtSignal()
+    # Emitted to (re)start the config save debounce; may fire off the GUI thread
+    config_save_requested = pyqtSignal()
+
+    def __init__(self, config, app: 'QApplication'):
         super().__init__()
 
         self.config = config
         self.app = app
+        self._saved_config: Optional[str] = None  # Last JSON written by _do_save_config
+
+        # Debounce config writes so a burst of theme changes hits disk once
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(500)
+        self._save_timer.timeout.connect(self._do_save_config)
+        # Handlers save from the click timer thread, and a QTimer can only be
+        # started from its own thread, so the start is queued to the GUI thread
+        self.config_save_requested.connect(self._save_timer.start)
 
         # Components
         self.api = SystemAPI()
@@ -119,6 +159,7 @@ class KeychronApp(QObject):
         self.plugin_manager = PluginManager()
 
         # UI - Qt overlay
+        from overlay_qt import EnhancedUIManager
         self.ui = EnhancedUIManager(theme=config['ui_theme'])
 
         # HID Reader Thread
@@ -131,11 +172,19 @@ class KeychronApp(QObject):
         self.is_pressed = False
         self.was_rotated_while_pressed = False
         self.ignore_next_release = False
-        self.last_command_index = 0
         self.timeout_timer = None # Added for timeout check
         self.volume_hide_timer = None # Auto-hide timer for quick volume
         self.last_activity_time = 0  # Track last activity for stuck press detection
 
+        # Event type -> handler, looked up once per HID event
+        self._event_handlers = {
+            HIDReaderThread.EVENT_CW: partial(self._handle_rotation, True),
+            HIDReaderThread.EVENT_CCW: partial(self._handle_rotation, False),
+            HIDReaderThread.EVENT_PRESS: self._handle_press,
+            HIDReaderThread.EVENT_RELEASE: self._handle_release,
+            HIDReaderThread.EVENT_DOUBLE_CLICK: self._handle_double_tap,
+        }
+
     def setup(self) -> bool:
         """Initialize all components"""
         logger.info("Initializing Keychron V1 Menu System (Qt)...")
@@ -178,6 +227,13 @@ class KeychronApp(QObject):
         self.state_machine.set_ui_callback(self._ui_callback)
         self.state_machine.set_notification_callback(lambda msg, duration: self.ui.show_notification(msg, duration))
 
+        # Timeout timer (1Hz) only runs while a menu timeout is pending
+        self.timeout_timer = QTimer(self)
+        self.timeout_timer.setInterval(1000)
+        self.timeout_timer.timeout.connect(self._check_timeout)
+        self.menu_timer_armed.connect(self.timeout_timer.start)
+        self.state_machine.set_timer_armed_callback(self.menu_timer_armed.emit)
+
         # Start UI
         logger.info("Starting UI...")
         self.ui.start()
@@ -186,14 +242,7 @@ class KeychronApp(QObject):
         self.tray_icon.start()
 
         # Connect to HID device
-        result = self._connect_hid()
-        
-        # Start timeout timer (1Hz)
-        self.timeout_timer = QTimer(self)
-        self.timeout_timer.timeout.connect(self._check_timeout)
-        self.timeout_timer.start(1000)
-        
-        return result
+        return self._connect_hid()
 
     def _check_timeout(self):
         """Check for menu timeout"""
@@ -205,6 +254,10 @@ class KeychronApp(QObject):
             else:
                 self.state_machine.exit_menu_mode()
 
+        # Idle until reset_menu_timer arms it again
+        if self.state_machine.state.menu_timer is None:
+            self.timeout_timer.stop()
+
     def _connect_hid(self) -> bool:
         """Connect to HID device"""
         logger.info("Connecting to HID device...")
@@ -219,6 +272,7 @@ class KeychronApp(QObject):
 
         # Connect signals
         self.hid_reader.event_received.connect(self._on_hid_event)
+        self.hid_reader.rotation_received.connect(self._on_hid_rotation)
         self.hid_reader.connection_established.connect(self._on_hid_connected)
         self.hid_reader.connection_lost.connect(self._on_hid_disconnected)
 
@@ -231,16 +285,14 @@ class KeychronApp(QObject):
     @pyqtSlot(int, int, int)
     def _on_hid_event(self, event_type: int, encoder_id: int, value: int):
         """Handle HID event (called on main thread via signal)"""
-        if event_type == HIDReaderThread.EVENT_CW:
-            self._handle_rotation(True)
-        elif event_type == HIDReaderThread.EVENT_CCW:
-            self._handle_rotation(False)
-        elif event_type == HIDReaderThread.EVENT_PRESS:
-            self._handle_press()
-        elif event_type == HIDReaderThread.EVENT_RELEASE:
-            self._handle_release()
-        elif event_type == HIDReaderThread.EVENT_DOUBLE_CLICK:
-            self._handle_double_tap()
+        handler = self._event_handlers.get(event_type)
+        if handler:
+            handler()
+
+    @pyqtSlot(int, int, int)
+    def _on_hid_rotation(self, event_type: int, encoder_id: int, count: int):
+        """Handle coalesced rotation events (called on main thread via signal)"""
+        self._handle_rotation(event_type == HIDReaderThread.EVENT_CW, count)
 
     @pyqtSlot()
     def _on_hid_connected(self):
@@ -254,10 +306,16 @@ class KeychronApp(QObject):
         logger.warning("HID device disconnected - attempting reconnect")
         self.ui.show_notification("Keyboard Disconnected", 2000)
 
-    def _handle_rotation(self, clockwise: bool):
-        """Handle encoder rotation"""
-        import time
-        current_time = time.time()
+    def _refresh_volume_handler(self):
+        """Re-sync the volume menu after a quick-volume change while it is open"""
+        if self.state_machine.state.menu_mode == MenuMode.VOLUME:
+            handler = self.state_machine.mode_handlers[MenuMode.VOLUME.value]
+            if handler:
+                handler.refresh()
+
+    def _handle_rotation(self, clockwise: bool, count: int = 1):
+        """Handle count encoder detents in one direction"""
+        current_time = time.monotonic()
 
         # Safety: If we think we are pressed but haven't seen activity in 1.5s, we missed a release
         if self.is_pressed and (current_time - self.last_activity_time) > 1.5:
@@ -274,9 +332,10 @@ class KeychronApp(QObject):
             self.was_rotated_while_pressed = True
 
             # Direct volume adjustment when button is held
-            delta = 2 if clockwise else -2
+            delta = 2 * count if clockwise else -2 * count
             self.api.volume.adjust_volume(delta)
             vol = self.api.volume.get_volume()
+            self._refresh_volume_handler()
 
             # Show volume wheel with progress
             display = {
@@ -305,32 +364,19 @@ class KeychronApp(QObject):
 
             return  # Early return - don't cycle commands
 
-        # Calculate new simulated index
-        # We need to simulate an absolute 0-3 rotation for the state machine
-        # which expects absolute values to detect direction or set command
-        count = self.state_machine.commands.count()
-        if count == 0: count = 4
-
         # Clockwise: left→center, Counter-clockwise: right→center
-        direction = -1 if clockwise else 1
-        new_index = (self.last_command_index + direction) % count
-
-        self.state_machine.handle_rotation(new_index)
-
-        # Update our local tracking
-        self.last_command_index = new_index
+        self.state_machine.handle_rotation_delta(-count if clockwise else count)
 
     def _handle_press(self):
         """Handle encoder press"""
-        import time
         logger.info("Press detected")
         self.is_pressed = True
         self.was_rotated_while_pressed = False
-        self.last_activity_time = time.time()
+        self.last_activity_time = time.monotonic()
 
     def _hide_volume_wheel(self):
         """Hide the volume wheel (called by timer or release)"""
-        logger.debug(f"_hide_volume_wheel called: mode={self.state_machine.state.menu_mode}, is_pressed={self.is_pressed}")
+        logger.debug("_hide_volume_wheel called: mode=%s, is_pressed=%s", self.state_machine.state.menu_mode, self.is_pressed)
         if self.state_machine.state.menu_mode == MenuMode.NORMAL:
             # If timer fired during quick volume, firmware didn't send release - force it
             if self.is_pressed and self.was_rotated_while_pressed:
@@ -347,9 +393,8 @@ class KeychronApp(QObject):
 
     def _handle_release(self):
         """Handle encoder release"""
-        import time
-        logger.info(f"Release detected: was_rotated={self.was_rotated_while_pressed}, mode={self.state_machine.state.menu_mode}")
-        self.last_activity_time = time.time()
+        logger.info("Release detected: was_rotated=%s, mode=%s", self.was_rotated_while_pressed, self.state_machine.state.menu_mode)
+        self.last_activity_time = time.monotonic()
 
         if self.ignore_next_release:
             self.ignore_next_release = False
@@ -381,23 +426,18 @@ class KeychronApp(QObject):
 
     def _register_commands(self):
         """Register main commands"""
-        from functools import partial
-
-        commands = [
-            ("Media Controls", "Play/Pause, Next/Prev", partial(self.state_machine.enter_mode, MenuMode.MEDIA)),
-            ("Volume", "System volume control", partial(self.state_machine.enter_mode, MenuMode.VOLUME)),
-            ("Window Management", "Cycle, Snap, Desktop", partial(self.state_machine.enter_mode, MenuMode.WINDOW_MENU)),
-            ("Theme Settings", "UI customization", partial(self.state_machine.enter_mode, MenuMode.THEME_MENU)),
-        ]
+        commands = self.BUILTIN_COMMANDS
 
         # Add Voicemeeter if available
         if self.vm.is_available():
-            commands.append(("Voicemeeter", "Audio routing", partial(self.state_machine.enter_mode, MenuMode.VOICEMEETER_MENU)))
+            commands += (self.VOICEMEETER_COMMAND,)
 
-        for name, desc, callback in commands:
-            self.state_machine.commands.register(name, desc, callback)
+        enter_mode = self.state_machine.enter_mode
+        self.state_machine.commands.register_many(
+            (name, desc, partial(enter_mode, mode)) for name, desc, mode in commands
+        )
 
-        logger.info(f"Registered {len(commands)} main commands")
+        logger.info("Registered %s main commands", len(commands))
 
     def _ui_callback(self, data: dict):
         """Handle UI callback from state machine"""
@@ -420,21 +460,35 @@ class KeychronApp(QObject):
             self.ui.show_menu(data, progress=progress, icons=icons)
 
     def _save_config(self):
+        """Schedule a config save; repeated calls within 500ms are merged"""
+        self.config_save_requested.emit()
+
+    def _do_save_config(self):
         """Save configuration to file"""
-        config_file = Path(__file__).parent / 'config.json'
+        config_file = _HERE / 'config.json'
+        serialized = json.dumps(self.config, indent=4)
+        if serialized == self._saved_config:
+            return  # Nothing changed since the last write
         try:
             with open(config_file, 'w') as f:
-                json.dump(self.config, f, indent=4)
+                f.write(serialized)
+            self._saved_config = serialized
         except Exception as e:
-            logger.error(f"Failed to save config: {e}")
+            logger.error("Failed to save config: %s", e)
 
     def quit(self):
         """Cleanup and exit"""
         logger.info("Shutting down...")
 
+        # Write out a save still waiting on the debounce timer (or on the
+        # queued start); a no-op when the config on disk is current
+        self._save_timer.stop()
+        self._do_save_config()
+
         if self.hid_reader:
             self.hid_reader.stop()
-            self.hid_reader.wait()
+            # Bounded so a hung hidapi call can't block shutdown
+            self.hid_reader.wait(HIDReaderThread.READ_TIMEOUT_MS * 2)
 
         if self.vm:
             self.vm.disconnect()
@@ -449,7 +503,7 @@ class KeychronApp(QObject):
 
 def load_config():
     """Load configuration from config.json"""
-    config_file = Path(__file__).parent / 'config.json'
+    config_file = _HERE / 'config.json'
 
     default_config = {
         'hid': {
@@ -473,7 +527,7 @@ def load_config():
                         config[key] = value
                 return config
         except Exception as e:
-            logger.error(f"Error loading config: {e}")
+            logger.error("Error loading config: %s", e)
 
     return default_config
 
@@ -490,7 +544,7 @@ def main():
 
     # Load available themes
     available_themes = ['DARK', 'LIGHT', 'CYBER']
-    themes_path = Path(__file__).parent / 'themes.json'
+    themes_path = _HERE / 'themes.json'
     if themes_path.exists():
         try:
             with open(themes_path, 'r') as f:
@@ -510,6 +564,7 @@ def main():
         config['ui_theme'] = 'DARK'
 
     # Create Qt application (MUST be on main thread)
+    from PyQt6.QtWidgets import QApplication
     app = QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)  # Keep running with tray icon
 
@@ -533,5 +588,5 @@ if __name__ == "__main__":
         logger.info("Interrupted by user")
         sys.exit(0)
     except Exception as e:
-        logger.exception(f"Fatal error: {e}")
+        logger.exception("Fatal error: %s", e)
         sys.exit(1)
\ No newline at end of file
@@ -0,0 +1,687 @@
+"""
+Keychron V1 Raw HID Protocol
+=============================
+
+Backend-agnostic Raw HID communication with the custom firmware, shared by
+the test tools:
+- KeychronV1HID: event parsing, LED commands, reader thread, reconnection
+- HidBackend: transport interface (open/close/read/write)
+- CythonHidBackend: cython-hidapi (pip install hidapi), used by hid_test.py
+- PywinusbBackend: pywinusb (pip install pywinusb), used by hid_test_pywinusb.py
+
+Each backend imports its HID library lazily, so only the one in use needs
+to be installed.
+"""
+
+import logging
+import os
+import sys
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+from log_ring import LogRing
+from spsc_ring import SpscRing
+
+# ========================================
+# KEYCHRON V1 USB IDENTIFIERS
+# ========================================
+# Note: These are Keychron's standard VID/PID
+# Verify with VIA or Device Manager if connection fails
+VENDOR_ID = 0x3434   # Keychron
+PRODUCT_ID = 0x0311  # V1 ANSI Encoder
+
+# Vendor-defined usage page of the Raw HID interface
+RAW_HID_USAGE_PAGE = 0xFF60
+
+# ========================================
+# PROTOCOL CONSTANTS
+# ========================================
+
+# Device -> Host Event Marker
+HID_EVT_MARKER = 0x01
+
+# Event Types
+EVT_ENCODER_CW = 0x01
+EVT_ENCODER_CCW = 0x02
+EVT_ENCODER_PRESS = 0x03
+EVT_ENCODER_RELEASE = 0x04
+EVT_ENCODER_LONG = 0x05
+EVT_ENCODER_DOUBLE = 0x06
+
+# Indexed by event type (types are small contiguous ints)
+EVENT_NAMES = (
+    None,           # 0x00 unused
+    "CW",           # EVT_ENCODER_CW
+    "CCW",          # EVT_ENCODER_CCW
+    "PRESS",        # EVT_ENCODER_PRESS
+    "RELEASE",      # EVT_ENCODER_RELEASE
+    "LONG_PRESS",   # EVT_ENCODER_LONG
+    "DOUBLE_TAP",   # EVT_ENCODER_DOUBLE
+)
+
+# Test tool LED feedback, indexed by event type (None = leave color)
+EVENT_COLORS = (
+    None,           # 0x00 unused
+    (0, 255, 0),    # EVT_ENCODER_CW: green
+    (255, 0, 0),    # EVT_ENCODER_CCW: red
+    (0, 0, 255),    # EVT_ENCODER_PRESS: blue
+    None,           # EVT_ENCODER_RELEASE
+    (255, 255, 0),  # EVT_ENCODER_LONG: yellow
+    (255, 0, 255),  # EVT_ENCODER_DOUBLE: magenta
+)
+
+# Host -> Device Command Marker
+HID_CMD_MARKER = 0x02
+
+# Command Types
+CMD_SET_MODE = 0x10
+CMD_SET_COLOR = 0x11
+
+# LED Modes
+MODE_DEFAULT = 0
+MODE_VOLUME = 1
+MODE_MEDIA = 2
+MODE_VOICEMEETER = 3
+MODE_WINDOW_MGMT = 4
+MODE_APP_LAUNCH = 5
+
+# Indexed by mode
+MODE_NAMES = (
+    "DEFAULT",      # MODE_DEFAULT
+    "VOLUME",       # MODE_VOLUME
+    "MEDIA",        # MODE_MEDIA
+    "VOICEMEETER",  # MODE_VOICEMEETER
+    "WINDOW_MGMT",  # MODE_WINDOW_MGMT
+    "APP_LAUNCH",   # MODE_APP_LAUNCH
+)
+
+# Raw HID packet size (excluding report ID)
+PACKET_SIZE = 32
+
+# Event packet header: marker, type, encoder, value, timestamp (LE u16)
+EVT_HDR_SIZE = 6
+
+# Event ring capacity (power of two)
+RING_SIZE = 256
+
+# Max events handed to the consumer per drain_events() call
+DRAIN_BATCH = 64
+
+# HID read timeout, matched to the Raw HID endpoint poll interval
+READ_TIMEOUT_MS = 10
+
+# Pin the reader thread to the last core and raise its priority.
+# Off by default so the tool doesn't steal a core on laptops.
+BOOST_READER_THREAD = False
+
+# Reconnect back-off (seconds)
+RECONNECT_MIN_S = 0.05
+RECONNECT_MAX_S = 2.0
+
+# Per-event and reader-thread messages go through this ring instead of
+# print(), so the HID path never blocks on the console
+log_ring = LogRing(logging.getLogger("keychron_hid"))
+
+# ========================================
+# DATA STRUCTURES
+# ========================================
+
+def event_name(event_type: int) -> str:
+    """Get a display name for an event type"""
+    name = EVENT_NAMES[event_type] if event_type < len(EVENT_NAMES) else None
+    return name if name is not None else f"UNKNOWN({event_type:02X})"
+
+
+@dataclass(slots=True)
+class EncoderEvent:
+    """Represents a parsed encoder event (pooled and filled in place)"""
+    event_type: int = 0
+    encoder_id: int = 0
+    value: int = 0
+    timestamp: int = 0
+
+    def __str__(self):
+        return f"[{self.timestamp:5d}ms] Encoder {self.encoder_id}: {event_name(self.event_type)} (val={self.value})"
+
+    def log(self):
+        """Queue this event on the log ring (fields are copied, so the slot can be reused)"""
+        log_ring.push(logging.INFO, "[%5dms] Encoder %d: %s (val=%d)",
+                      self.timestamp, self.encoder_id, event_name(self.event_type), self.value)
+
+
+# ========================================
+# THREAD TUNING
+# ========================================
+
+def boost_current_thread():
+    """Pin the calling thread to the last CPU core and raise its priority"""
+    core = (os.cpu_count() or 1) - 1
+
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            THREAD_PRIORITY_ABOVE_NORMAL = 1
+            kernel32 = ctypes.windll.kernel32
+            handle = kernel32.GetCurrentThread()  # Pseudo-handle, no close needed
+            kernel32.SetThreadAffinityMask(handle, ctypes.c_size_t(1 << core))
+            kernel32.SetThreadPriority(handle, THREAD_PRIORITY_ABOVE_NORMAL)
+        elif hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, {core})  # 0 = calling thread on Linux
+            try:
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(1))
+            except PermissionError:
+                pass  # Real-time scheduling needs CAP_SYS_NICE
+        print(f"--> Reader thread pinned to core {core}")
+    except Exception as e:
+        print(f"[WARN] Could not tune reader thread: {e}")
+
+
+# ========================================
+# HID BACKENDS
+# ========================================
+
+class HidBackend(ABC):
+    """Transport for the Raw HID interface, driven by KeychronV1HID's reader thread"""
+
+    # Where the 32-byte packet starts in buffers returned by read()
+    REPORT_OFFSET = 0
+    # Timeout the reader thread passes to read(); bounds how long stop() waits
+    READ_TIMEOUT_MS = READ_TIMEOUT_MS
+
+    @abstractmethod
+    def open(self) -> bool:
+        """Open the Raw HID interface. Returns False if it isn't available."""
+
+    @abstractmethod
+    def close(self):
+        """Close the device (must be safe to call when not open)"""
+
+    @abstractmethod
+    def read(self, timeout_ms: int) -> Optional[Sequence[int]]:
+        """Block up to timeout_ms for a report
+
+        Returns a sequence of byte values (list or bytearray) holding the
+        packet at REPORT_OFFSET, valid until the next read(), or None on
+        timeout. Raises on device errors.
+        """
+
+    @abstractmethod
+    def write(self, report: bytearray):
+        """Send a report: report ID (0x00) followed by the 32-byte packet"""
+
+
+class CythonHidBackend(HidBackend):
+    """cython-hidapi transport (blocking reads with timeout)"""
+
+    def __init__(self):
+        import hid
+        self._hid = hid
+        self.device = None
+
+    def open(self) -> bool:
+        hid = self._hid
+        # Find the Raw HID interface (usage_page 0xFF60)
+        devices = hid.enumerate(VENDOR_ID, PRODUCT_ID)
+        raw_hid_path = None
+
+        for dev in devices:
+            # Look for the vendor-specific usage page (Raw HID)
+            if dev['usage_page'] == RAW_HID_USAGE_PAGE:
+                raw_hid_path = dev['path']
+                break
+
+        if not raw_hid_path:
+            print("[ERROR] Raw HID interface not found!")
+            print("Available interfaces:")
+            for dev in devices:
+                print(f"  Interface {dev['interface_number']}: Usage Page 0x{dev['usage_page']:04X}")
+            return False
+
+        device = hid.device()
+        device.open_path(raw_hid_path)
+        device.set_nonblocking(0)  # Use blocking reads
+        self.device = device
+
+        # Get device info
+        manufacturer = device.get_manufacturer_string()
+        product = device.get_product_string()
+        print(f"[OK] Connected to: {manufacturer} {product}")
+        print(f"  VID: 0x{VENDOR_ID:04X}, PID: 0x{PRODUCT_ID:04X}, Usage Page: 0x{RAW_HID_USAGE_PAGE:04X}")
+        return True
+
+    def close(self):
+        if self.device:
+            try:
+                self.device.close()
+            except Exception:
+                pass
+            self.device = None
+
+    def read(self, timeout_ms: int) -> Optional[list]:
+        # Returns as soon as a report arrives. cython-hidapi wraps
+        # hid_read_timeout in `with nogil:`, so other threads keep running
+        # while this waits - no separate shim is needed.
+        data = self.device.read(PACKET_SIZE, timeout_ms=timeout_ms)
+        # hidapi already allocated this list; it is parsed as-is
+        if len(data) < EVT_HDR_SIZE:
+            return None
+        return data
+
+    def write(self, report: bytearray):
+        self.device.write(report)
+
+
+class PywinusbBackend(HidBackend):
+    """pywinusb transport (Windows). Bridges the data callback to blocking reads."""
+
+    # Reports are handed over whole; byte 0 is the report ID
+    REPORT_OFFSET = 1
+    # read() wakes as soon as the callback publishes a report, so the timeout
+    # only sets how often an idle reader checks is_plugged()
+    READ_TIMEOUT_MS = 100
+
+    def __init__(self):
+        import pywinusb.hid as hid
+        self._hid = hid
+        self.device = None
+        self._out_report = None  # Cached output report for the open device
+        # pywinusb callback thread -> reader thread; wait() blocks on an Event.
+        # Slots are report ID + packet, parsed in place at REPORT_OFFSET.
+        self._reports = SpscRing(RING_SIZE, factory=lambda: bytearray(1 + PACKET_SIZE))
+        self._held = False  # Last read() slot not yet released to the callback
+
+    def find_raw_hid_device(self):
+        """Find the Raw HID interface (not keyboard or consumer control)"""
+        # Get all Keychron V1 devices
+        all_devices = self._hid.HidDeviceFilter(vendor_id=VENDOR_ID, product_id=PRODUCT_ID).get_devices()
+
+        if not all_devices:
+            print(f"[ERR] No devices found with VID=0x{VENDOR_ID:04X}, PID=0x{PRODUCT_ID:04X}")
+            return None
+
+        print(f"Found {len(all_devices)} HID interface(s) for Keychron V1:")
+
+        # Try to find Raw HID interface
+        # Raw HID typically has usage_page 0xFF60 or similar vendor-defined page
+        for idx, device in enumerate(all_devices):
+            print(f"  [{idx}] Path: {device.device_path}")
+
+            # Open and check reports
+            device.open()
+
+            # Check output reports (for sending commands)
+            out_reports = device.find_output_reports()
+
+            if out_reports:
+                print(f"      Has output reports: {len(out_reports)}")
+                # Try this device
+                return device
+
+            device.close()
+
+        # If no device with output reports found, use the first one
+        print(f"\nUsing first device (may need manual selection)")
+        all_devices[0].open()
+        return all_devices[0]
+
+    def open(self) -> bool:
+        device = self.find_raw_hid_device()
+        if not device:
+            return False
+
+        # Drop reports left over from a previous connection
+        self._held = False
+        while self._reports.get() is not None:
+            pass
+
+        self.device = device
+        device.set_raw_data_handler(self._on_data_received)
+
+        print(f"[OK] Connected to: {device.vendor_name} {device.product_name}")
+        print(f"  VID: 0x{VENDOR_ID:04X}, PID: 0x{PRODUCT_ID:04X}")
+        return True
+
+    def close(self):
+        if self.device:
+            try:
+                self.device.close()
+            except Exception:
+                pass
+            self.device = None
+            self._out_report = None
+
+    def _on_data_received(self, data):
+        """Callback for incoming HID data (pywinusb thread)"""
+        # pywinusb returns a list including report ID as first byte
+        n = len(data)
+        if n < 1 + PACKET_SIZE:
+            return
+
+        slot = self._reports.claim()
+        if slot is not None:
+            # Copy into the pooled buffer (same length, so no reallocation)
+            slot[:] = data if n == 1 + PACKET_SIZE else data[:1 + PACKET_SIZE]
+            self._reports.publish()
+
+    def read(self, timeout_ms: int) -> Optional[bytearray]:
+        reports = self._reports
+        if self._held:
+            # The previous report has been parsed; hand its slot back
+            reports.release(1)
+            self._held = False
+
+        report = reports.peek()
+        if report is None:
+            if not self.device.is_plugged():
+                raise IOError("Device unplugged")
+            if not reports.wait(timeout_ms / 1000):
+                return None
+            report = reports.peek()
+        self._held = True
+        return report
+
+    def write(self, report: bytearray):
+        # Get output report (looked up once per connection)
+        out_report = self._out_report
+        if out_report is None:
+            out_reports = self.device.find_output_reports()
+            if not out_reports:
+                raise IOError("No output reports found")
+            out_report = self._out_report = out_reports[0]
+
+        out_report.set_raw_data(report)
+        out_report.send()
+
+
+# ========================================
+# HID COMMUNICATION CLASS
+# ========================================
+
+class KeychronV1HID:
+    """Handles Raw HID communication with Keychron V1 firmware over a HidBackend"""
+
+    def __init__(self, backend: HidBackend):
+        self.backend = backend
+        # Set to the backend while it is open. Guarded by _device_lock so a
+        # command write can't interleave with a close; readers take one local
+        # copy instead of re-checking the attribute.
+        self._device_slot: Optional[HidBackend] = None
+        self._device_lock = threading.RLock()
+        # HID thread -> consumer, with pre-allocated EncoderEvent slots
+        self.event_queue = SpscRing(RING_SIZE, factory=EncoderEvent)
+        # Consumer-side copies returned by drain_events(), so ring slots can
+        # be released in one step while the batch is still being processed
+        self._batch = [EncoderEvent() for _ in range(DRAIN_BATCH)]
+        self._running = threading.Event()
+        self.reader_thread: Optional[threading.Thread] = None
+        # Cuts a reconnect back-off short (stop() or request_reconnect())
+        self._reconnect_evt = threading.Event()
+
+        # Reused command packet. HID write on Windows requires report ID as
+        # first byte (0x00 for Raw HID), followed by the 32-byte packet.
+        self._tx = bytearray(1 + PACKET_SIZE)
+        self._tx[1] = HID_CMD_MARKER
+
+        # Last LED state sent, to skip redundant USB writes
+        self._last_color = None
+        self._last_mode = None
+
+    @property
+    def connected(self) -> bool:
+        return self._device_slot is not None
+
+    @property
+    def running(self) -> bool:
+        return self._running.is_set()
+
+    def connect(self) -> bool:
+        """Attempt to connect to the keyboard"""
+        backend = self.backend
+        with self._device_lock:
+            try:
+                if backend.open():
+                    self._device_slot = backend
+            except Exception as e:
+                print(f"[ERROR] Connection failed: {e}")
+                backend.close()
+            return self._device_slot is not None
+
+    def disconnect(self):
+        """Close the HID device"""
+        with self._device_lock:
+            device = self._device_slot
+            if device is None:
+                return
+            self._device_slot = None
+            device.close()
+            # Device may come back with different LED state
+            self._last_color = None
+            self._last_mode = None
+        print("[OK] Disconnected")
+
+    def send_command(self, sub_command: int, arg1: int = 0, arg2: int = 0, arg3: int = 0):
+        """Send a command to the keyboard"""
+        try:
+            with self._device_lock:
+                device = self._device_slot
+                if device is None:
+                    log_ring.push(logging.WARNING, "[WARN] Cannot send command: Not connected")
+                    return False
+
+                tx = self._tx
+                tx[2] = sub_command
+                tx[3] = arg1
+                tx[4] = arg2
+                tx[5] = arg3
+
+                device.write(tx)
+            return True
+
+        except Exception as e:
+            log_ring.push(logging.WARNING, "[WARN] Send failed: %s", e)
+            return False
+
+    def set_led_mode(self, mode: int):
+        """Set the LED mode"""
+        if mode == self._last_mode:
+            return True
+        mode_name = MODE_NAMES[mode] if 0 <= mode < len(MODE_NAMES) else f"UNKNOWN({mode})"
+        log_ring.push(logging.INFO, "--> Setting LED mode: %s", mode_name)
+        ok = self.send_command(CMD_SET_MODE, mode)
+        if ok:
+            self._last_mode = mode
+        return ok
+
+    def set_led_color(self, r: int, g: int, b: int):
+        """Set the LED color (0-255 RGB)"""
+        color = (r, g, b)
+        if color == self._last_color:
+            return True
+        log_ring.push(logging.INFO, "--> Setting LED color: RGB(%d, %d, %d)", r, g, b)
+        ok = self.send_command(CMD_SET_COLOR, r, g, b)
+        if ok:
+            self._last_color = color
+        return ok
+
+    def parse_event(self, buf, slot: EncoderEvent, offset: int = 0) -> bool:
+        """Parse a packet starting at offset in buf (byte values) into a pooled EncoderEvent slot"""
+        # Check for our event marker
+        if buf[offset] != HID_EVT_MARKER:
+            return False
+
+        slot.event_type = buf[offset + 1]
+        slot.encoder_id = buf[offset + 2]
+        slot.value = buf[offset + 3]
+        slot.timestamp = buf[offset + 4] | (buf[offset + 5] << 8)  # LE u16
+
+        return True
+
+    def reader_worker(self):
+        """HID reader thread - blocks on reads with timeout, reconnects inline
+
+        This thread is the only one that opens, reads and closes the backend
+        once started, so reconnects can't race a read. Command writes from
+        other threads serialize with open/close through _device_lock.
+        """
+        print("--> HID reader thread started")
+
+        if BOOST_READER_THREAD:
+            boost_current_thread()
+
+        running = self._running
+        backoff = RECONNECT_MIN_S
+
+        while running.is_set():
+            device = self._device_slot
+            if device is None:
+                log_ring.push(logging.INFO, "--> Attempting reconnection...")
+                if not self.connect():
+                    # Sleeps without polling; a nudge retries immediately
+                    if self._reconnect_evt.wait(backoff):
+                        self._reconnect_evt.clear()
+                        backoff = RECONNECT_MIN_S
+                    else:
+                        backoff = min(backoff * 2, RECONNECT_MAX_S)
+                    continue
+                backoff = RECONNECT_MIN_S
+                device = self._device_slot
+
+            try:
+                # The timeout lets the loop notice stop()/disconnects promptly
+                data = device.read(device.READ_TIMEOUT_MS)
+
+                if data is not None:
+                    slot = self.event_queue.claim()
+                    if slot is not None and self.parse_event(data, slot, device.REPORT_OFFSET):
+                        self.event_queue.publish()
+
+            except Exception as e:
+                log_ring.push(logging.WARNING, "[WARN] Read error: %s", e)
+                self.disconnect()
+
+        print("--> HID reader thread stopped")
+
+    def start(self):
+        """Start the HID reader thread"""
+        if self.running:
+            print("[WARN] Already running")
+            return
+
+        self._running.set()
+        self._reconnect_evt.clear()
+        log_ring.start()
+
+        # Start reader thread
+        self.reader_thread = threading.Thread(target=self.reader_worker, daemon=True)
+        self.reader_thread.start()
+
+        print("[OK] HID system started")
+
+    def stop(self):
+        """Stop all threads and disconnect"""
+        print("--> Stopping HID system...")
+        self._running.clear()
+        self._reconnect_evt.set()
+
+        if self.reader_thread:
+            self.reader_thread.join(timeout=2)
+
+        self.disconnect()
+        log_ring.stop()
+        print("[OK] HID system stopped")
+
+    def request_reconnect(self):
+        """Retry the connection now instead of after the current back-off (e.g. on device arrival)"""
+        self._reconnect_evt.set()
+
+    def get_event(self, timeout: float = 0.1) -> Optional[EncoderEvent]:
+        """Get next event from queue (non-blocking with timeout)"""
+        event = self.event_queue.get()
+        if event is None and self.event_queue.wait(timeout):
+            event = self.event_queue.get()
+        return event
+
+    def wait_for_events(self, timeout: float = 0.1) -> bool:
+        """Block until events are queued. Returns False on timeout."""
+        return self.event_queue.wait(timeout)
+
+    def drain_events(self, max_n: int = DRAIN_BATCH) -> List[EncoderEvent]:
+        """Take every queued event (up to max_n) at once
+
+        The returned events are reused by the next drain_events() call.
+        """
+        ring = self.event_queue
+        slots = ring.peek_batch(min(max_n, DRAIN_BATCH))
+        batch = self._batch
+        for dst, src in zip(batch, slots):
+            dst.event_type = src.event_type
+            dst.encoder_id = src.encoder_id
+            dst.value = src.value
+            dst.timestamp = src.timestamp
+        n = len(slots)
+        ring.release(n)
+        return batch[:n]
+
+
+# ========================================
+# TEST APPLICATION
+# ========================================
+
+def test_interactive(backend: HidBackend, title: str, vidpid_hint: str = "VID/PID are correct for your variant"):
+    """Interactive test application"""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    print("=" * 60)
+    print(title)
+    print("=" * 60)
+    print()
+
+    hid_system = KeychronV1HID(backend)
+
+    # Initial connection
+    if not hid_system.connect():
+        print("\nMake sure:")
+        print("  1. Keyboard is plugged in")
+        print("  2. Custom firmware is flashed")
+        print(f"  3. {vidpid_hint}")
+        return
+
+    # Start threads
+    hid_system.start()
+
+    print()
+    print("Commands:")
+    print("  1-5: Set LED mode (1=Volume, 2=Media, 3=VM, 4=Window, 5=AppLaunch)")
+    print("  r/g/b: Set LED color (red/green/blue)")
+    print("  Ctrl+C: Quit")
+    print()
+    print("Waiting for encoder events... (rotate knob or press)")
+    print("-" * 60)
+
+    try:
+        while True:
+            # Block until events arrive (or 100ms pass), then take them all
+            if not hid_system.wait_for_events(timeout=0.1):
+                continue
+
+            color = None
+            for event in hid_system.drain_events():
+                event.log()
+
+                # Example: Auto-change LED color on different events
+                event_type = event.event_type
+                if event_type < len(EVENT_COLORS):
+                    color = EVENT_COLORS[event_type] or color
+
+            # Only the latest color matters, so a burst costs one USB write
+            if color:
+                hid_system.set_led_color(*color)
+
+    except KeyboardInterrupt:
+        print("\n\n--> Interrupted by user")
+
+    finally:
+        hid_system.stop()
+        print("\nTest completed.")
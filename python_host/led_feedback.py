@@ -9,8 +9,14 @@ Provides visual feedback on the keyboard RGB LEDs:
 """
 
 import time
-from typing import Optional, Tuple
+import struct
+import threading
+from typing import TYPE_CHECKING, List, Optional, Tuple, Union
 from enum import Enum, auto
+from types import MappingProxyType
+
+if TYPE_CHECKING:
+    from menu_system import MenuMode  # menu_system imports this module
 
 
 # Protocol constants (must match firmware)
@@ -18,6 +24,12 @@ HID_CMD_MARKER = 0xFE
 CMD_LED_MODE = 0x01
 CMD_LED_COLOR = 0x02
 
+# Command report header: marker, command, arg1, arg2, arg3
+_CMD_HDR = struct.Struct('<BBBBB')
+
+# Upper bound on LED report writes per second (one writer thread paces them)
+LED_MAX_FPS = 120
+
 
 class LEDMode(Enum):
     """LED display modes"""
@@ -46,6 +58,47 @@ class LEDTheme:
     ROTATE_CCW = (255, 100, 0)    # Orange - counter-clockwise
 
 
+# Menu mode name -> LED color (read-only; shared with menu_system)
+MODE_COLORS = MappingProxyType({
+    'NORMAL': LEDTheme.NORMAL,
+    'MEDIA': LEDTheme.MEDIA,
+    'VOLUME': LEDTheme.VOLUME,
+    'VM_SYSTEM': LEDTheme.VOICEMEETER,
+    'VM_MAIN_ROUTING': LEDTheme.VOICEMEETER,
+    'VM_MUSIC_GAIN': LEDTheme.VOICEMEETER,
+    'VM_MUSIC_ROUTING': LEDTheme.VOICEMEETER,
+    'VM_COMM_GAIN': LEDTheme.VOICEMEETER,
+    'VM_COMM_ROUTING': LEDTheme.VOICEMEETER,
+    'VOICEMEETER_MENU': LEDTheme.VOICEMEETER,
+    'WINDOW_MENU': LEDTheme.WINDOW,
+    'WINDOW_CYCLE': LEDTheme.WINDOW,
+    'WINDOW_SNAP': LEDTheme.WINDOW,
+})
+
+# Event name -> flash color (read-only)
+EVENT_COLORS = MappingProxyType({
+    'press': LEDTheme.PRESS,
+    'rotate_cw': LEDTheme.ROTATE_CW,
+    'rotate_ccw': LEDTheme.ROTATE_CCW,
+    'success': LEDTheme.SUCCESS,
+    'error': LEDTheme.ERROR,
+})
+
+
+def _build_packet(command: int, arg1: int, arg2: int, arg3: int) -> bytes:
+    """Build a 32-byte command report"""
+    return bytes((HID_CMD_MARKER, command, arg1, arg2, arg3)) + bytes(27)
+
+
+# The theme palette and LED modes are a closed set, so their reports are
+# built once here and written as-is on mode switches and event flashes
+_THEME_PACKETS = {
+    rgb: _build_packet(CMD_LED_COLOR, *rgb)
+    for rgb in set(MODE_COLORS.values()) | set(EVENT_COLORS.values())
+}
+_LED_MODE_PACKETS = {mode: _build_packet(CMD_LED_MODE, mode.value, 0, 0) for mode in LEDMode}
+
+
 class LEDFeedback:
     """LED feedback controller"""
 
@@ -57,35 +110,32 @@ class LEDFeedback:
         self.device = hid_device
         self.current_color = LEDTheme.NORMAL
         self.enabled = True
-
-    def set_mode_color(self, mode: str):
+        self._tx_buf = bytearray(32)  # Reused for every non-prebuilt command (writer thread)
+
+        # Writes go through a writer thread so callers (the HID reader, menu
+        # handlers) never block on a slow hid_write. Pending entries are
+        # (rgb, packet): colors carry rgb, LED mode commands carry rgb=None.
+        self._pending: List[Tuple[Optional[Tuple[int, int, int]], Optional[bytes]]] = []
+        self._pending_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._writer = threading.Thread(target=self._writer_worker, name="LEDWriter", daemon=True)
+        self._writer.start()
+
+    def set_mode_color(self, mode: Union['MenuMode', str]):
         """Set LED color based on menu mode
 
         Args:
-            mode: Menu mode name (e.g., 'MEDIA', 'VOLUME', 'VOICEMEETER_MENU')
+            mode: MenuMode (carries its led_color) or mode name
+                  (e.g., 'MEDIA', 'VOLUME', 'VOICEMEETER_MENU')
         """
         if not self.enabled:
             return
 
-        # Map modes to colors
-        color_map = {
-            'NORMAL': LEDTheme.NORMAL,
-            'MEDIA': LEDTheme.MEDIA,
-            'VOLUME': LEDTheme.VOLUME,
-            'VM_SYSTEM': LEDTheme.VOICEMEETER,
-            'VM_MAIN_ROUTING': LEDTheme.VOICEMEETER,
-            'VM_MUSIC_GAIN': LEDTheme.VOICEMEETER,
-            'VM_MUSIC_ROUTING': LEDTheme.VOICEMEETER,
-            'VM_COMM_GAIN': LEDTheme.VOICEMEETER,
-            'VM_COMM_ROUTING': LEDTheme.VOICEMEETER,
-            'VOICEMEETER_MENU': LEDTheme.VOICEMEETER,
-            'WINDOW_MENU': LEDTheme.WINDOW,
-            'WINDOW_CYCLE': LEDTheme.WINDOW,
-            'WINDOW_SNAP': LEDTheme.WINDOW,
-        }
-
-        color = color_map.get(mode, LEDTheme.NORMAL)
-        self.set_color(color)
+        if isinstance(mode, str):
+            self.set_color(MODE_COLORS.get(mode, LEDTheme.NORMAL))
+        else:
+            self.set_color(mode.led_color)
 
     def set_color(self, rgb: Tuple[int, int, int]):
         """Set solid LED color
@@ -93,15 +143,23 @@ class LEDFeedback:
         Args:
             rgb: RGB tuple (0-255 each)
         """
+        self.send_color(rgb, remember=True)
+
+    def send_color(self, rgb: Tuple[int, int, int], packet: Optional[bytes] = None,
+                   remember: bool = False):
+        """Queue a color write, e.g. an animation frame
+
+        Args:
+            rgb: RGB tuple (0-255 each)
+            packet: Prebuilt report for rgb, if the caller has one
+            remember: Also record rgb as current_color
+        """
         if not self.enabled or not self.device:
             return
 
-        try:
-            r, g, b = rgb
-            self._send_command(CMD_LED_COLOR, r, g, b)
+        if remember:
             self.current_color = rgb
-        except Exception as e:
-            print(f"[WARN] LED color command failed: {e}")
+        self._enqueue(rgb, packet if packet is not None else _THEME_PACKETS.get(rgb))
 
     def set_value_indicator(self, value: float, color_low: Tuple[int, int, int],
                            color_high: Tuple[int, int, int]):
@@ -135,7 +193,7 @@ class LEDFeedback:
             self.set_color(color)
 
         # Send pulse mode command
-        self._send_command(CMD_LED_MODE, LEDMode.PULSE.value, 0, 0)
+        self._enqueue(None, _LED_MODE_PACKETS[LEDMode.PULSE])
 
     def breathing(self, color: Tuple[int, int, int] = None):
         """Start breathing effect
@@ -150,7 +208,7 @@ class LEDFeedback:
             self.set_color(color)
 
         # Send breathing mode command
-        self._send_command(CMD_LED_MODE, LEDMode.BREATHING.value, 0, 0)
+        self._enqueue(None, _LED_MODE_PACKETS[LEDMode.BREATHING])
 
     def flash_event(self, event_type: str):
         """Flash LED for event feedback
@@ -161,15 +219,7 @@ class LEDFeedback:
         if not self.enabled:
             return
 
-        color_map = {
-            'press': LEDTheme.PRESS,
-            'rotate_cw': LEDTheme.ROTATE_CW,
-            'rotate_ccw': LEDTheme.ROTATE_CCW,
-            'success': LEDTheme.SUCCESS,
-            'error': LEDTheme.ERROR,
-        }
-
-        color = color_map.get(event_type, LEDTheme.PRESS)
+        color = EVENT_COLORS.get(event_type, LEDTheme.PRESS)
         self.pulse(color)
 
     def _send_command(self, command: int, arg1: int, arg2: int, arg3: int):
@@ -183,20 +233,69 @@ class LEDFeedback:
             return
 
         try:
-            # Build packet
-            packet = bytearray(32)
-            packet[0] = HID_CMD_MARKER
-            packet[1] = command
-            packet[2] = arg1
-            packet[3] = arg2
-            packet[4] = arg3
+            # Only the header changes; the padding stays zero
+            _CMD_HDR.pack_into(self._tx_buf, 0, HID_CMD_MARKER, command, arg1, arg2, arg3)
+
+            # Send to device (hidapi copies the buffer before returning)
+            self.device.write(self._tx_buf)
 
-            # Send to device
-            self.device.write(bytes(packet))
+        except Exception as e:
+            print(f"[WARN] LED command failed: {e}")
+
+    def _write(self, packet: bytes):
+        """Send a prebuilt report to firmware"""
+        if not self.device:
+            return
 
+        try:
+            self.device.write(packet)
         except Exception as e:
             print(f"[WARN] LED command failed: {e}")
 
+    def _enqueue(self, rgb: Optional[Tuple[int, int, int]], packet: Optional[bytes]):
+        """Queue a color (rgb, optional prebuilt packet) or LED mode packet for the writer"""
+        entry = (rgb, packet)
+        with self._pending_lock:
+            pending = self._pending
+            if rgb is not None and pending and pending[-1][0] is not None:
+                pending[-1] = entry  # Latest wins: replace a color not yet written
+            elif not pending or pending[-1] != entry:
+                pending.append(entry)
+        self._wake.set()
+
+    def flush(self):
+        """Write everything queued, in order"""
+        with self._pending_lock:
+            pending, self._pending = self._pending, []
+
+        for rgb, packet in pending:
+            if packet is not None:
+                self._write(packet)
+            else:
+                try:
+                    r, g, b = rgb
+                    self._send_command(CMD_LED_COLOR, r, g, b)
+                except Exception as e:
+                    print(f"[WARN] LED color command failed: {e}")
+
+    def close(self):
+        """Stop the writer thread after writing what is queued"""
+        self._closed = True
+        self._wake.set()
+        self._writer.join(timeout=0.5)
+        self.flush()
+
+    def _writer_worker(self):
+        """Writer thread - at most one batch of writes per frame"""
+        interval = 1 / LED_MAX_FPS
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if self._closed:
+                return
+            self.flush()
+            time.sleep(interval)
+
     def enable(self):
         """Enable LED feedback"""
         self.enabled = True
@@ -210,12 +309,28 @@ class LEDFeedback:
 # LED ANIMATOR
 # ============================================================================
 
+def _ramp_rgb(value: float) -> Tuple[int, int, int]:
+    """Green to yellow to red gradient for a value 0.0-1.0"""
+    if value < 0.5:
+        return (int(value * 2 * 255), 255, 0)
+    return (255, int((1.0 - value) * 2 * 255), 0)
+
+
 class LEDAnimator:
     """Animated LED effects"""
 
+    # Volume ramp colors and their finished reports, indexed by int(value * 255)
+    _RAMP_COLORS = [_ramp_rgb(i / 255) for i in range(256)]
+    _RAMP_LUT = [_build_packet(CMD_LED_COLOR, *rgb) for rgb in _RAMP_COLORS]
+
     def __init__(self, led_feedback: LEDFeedback):
         self.led = led_feedback
         self.running = False
+        # One worker runs every ramp; a new ramp supersedes the one in progress.
+        # Imported here: concurrent.futures is only needed once animations are used
+        from concurrent.futures import ThreadPoolExecutor
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="LEDAnimator")
+        self._generation = 0
 
     def volume_ramp(self, start_value: float, end_value: float, duration: float = 0.5):
         """Animate LED color as value changes
@@ -225,47 +340,56 @@ class LEDAnimator:
             end_value: Ending value 0.0-1.0
             duration: Animation duration in seconds
         """
-        import threading
+        led = self.led
+        colors = self._RAMP_COLORS
+        lut = self._RAMP_LUT
+        self._generation += 1
+        generation = self._generation
+
+        # Interpolate table indices rather than values: integer math per frame
+        first = min(max(int(start_value * 255), 0), 255)
+        span = min(max(int(end_value * 255), 0), 255) - first
 
         def animate():
             steps = int(duration * 60)  # 60 FPS
+            frame = duration / steps if steps else 0
+            start = time.monotonic()
             for i in range(steps):
-                if not self.running:
+                if not self.running or self._generation != generation:
                     break
 
-                t = i / steps
-                value = start_value + (end_value - start_value) * t
+                idx = first + span * i // steps
 
-                # Green to yellow to red gradient
-                if value < 0.5:
-                    color = (int(value * 2 * 255), 255, 0)
-                else:
-                    color = (255, int((1.0 - value) * 2 * 255), 0)
+                # Each frame is a table lookup and a queued write
+                led.send_color(colors[idx], lut[idx], remember=True)
 
-                self.led.set_color(color)
-                time.sleep(duration / steps)
+                # Sleep to the frame's deadline so per-frame overhead doesn't accumulate
+                delay = start + (i + 1) * frame - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
 
         self.running = True
-        thread = threading.Thread(target=animate, daemon=True)
-        thread.start()
+        self._executor.submit(animate)
 
     def stop(self):
         """Stop animation"""
         self.running = False
+        self._generation += 1
 
 
 # ============================================================================
 # TESTING
 # ============================================================================
 
-if __name__ == "__main__":
+def _selftest():
+    """Exercise LEDFeedback against a mock device (run this module directly)"""
     print("LED Feedback Test")
     print("Note: Requires connected keyboard with Raw HID firmware")
 
     # Mock HID device for testing
     class MockHIDDevice:
         def write(self, data):
-            print(f"  LED Command: {' '.join(f'{b:02X}' for b in data[:8])}")
+            print(f"  LED Command: {bytes(data[:8]).hex(' ').upper()}")
 
     mock_device = MockHIDDevice()
     led = LEDFeedback(mock_device)
@@ -288,4 +412,9 @@ if __name__ == "__main__":
         led.flash_event(event)
         time.sleep(0.5)
 
+    led.close()
     print("\nDone!")
+
+
+if __name__ == "__main__":
+    _selftest()
@@ -6,29 +6,26 @@ import hid
 print("Enumerating all HID devices...")
 print("=" * 80)
 
+# Enumeration is the slow part (a kernel round-trip per device), so do it once
 devices = hid.enumerate()
 
-keychron_devices = []
+keychron_devices = [
+    d for d in devices
+    if (m := d['manufacturer_string']) and 'keychron' in m.lower()
+]
 
-for device in devices:
-    vid = device['vendor_id']
-    pid = device['product_id']
-    manufacturer = device['manufacturer_string']
-    product = device['product_string']
-    interface = device['interface_number']
-    usage_page = device['usage_page']
-    usage = device['usage']
-    
-    # Print all devices
-    print(f"VID: 0x{vid:04X}  PID: 0x{pid:04X}  Interface: {interface}")
-    print(f"  Manufacturer: {manufacturer}")
-    print(f"  Product: {product}")
-    print(f"  Usage Page: 0x{usage_page:04X}  Usage: 0x{usage:04X}")
-    print()
-    
-    # Look for Keychron devices
-    if manufacturer and 'keychron' in manufacturer.lower():
-        keychron_devices.append(device)
+# Print all devices (built up and written once rather than per line)
+DEVICE_FMT = (
+    "VID: 0x%04X  PID: 0x%04X  Interface: %d\n"
+    "  Manufacturer: %s\n"
+    "  Product: %s\n"
+    "  Usage Page: 0x%04X  Usage: 0x%04X\n"
+)
+print("\n".join([
+    DEVICE_FMT % (d['vendor_id'], d['product_id'], d['interface_number'],
+                  d['manufacturer_string'], d['product_string'], d['usage_page'], d['usage'])
+    for d in devices
+]))
 
 print("=" * 80)
 
@@ -41,7 +38,7 @@ if keychron_devices:
         print(f"  Product: {device['product_string']}")
         print()
     
-    print("\nUpdate hid_test.py with these values:")
+    print("\nUpdate keychron_hid.py with these values:")
     device = keychron_devices[0]
     print(f"VENDOR_ID = 0x{device['vendor_id']:04X}")
     print(f"PRODUCT_ID = 0x{device['product_id']:04X}")
@@ -6,40 +6,37 @@ import pywinusb.hid as hid
 print("Enumerating all HID devices...")
 print("=" * 80)
 
-all_devices = hid.find_all_hid_devices()
+# Enumerate once and read each device's properties once
+all_devices = [
+    (device.vendor_id, device.product_id, device.vendor_name, device.product_name, device.device_path)
+    for device in hid.find_all_hid_devices()
+]
 
-keychron_devices = []
+keychron_devices = [d for d in all_devices if d[2] and 'keychron' in d[2].lower()]
 
-for device in all_devices:
-    vid = device.vendor_id
-    pid = device.product_id
-    manufacturer = device.vendor_name
-    product = device.product_name
-    
-    print(f"VID: 0x{vid:04X}  PID: 0x{pid:04X}")
-    print(f"  Manufacturer: {manufacturer}")
-    print(f"  Product: {product}")
-    print(f"  Path: {device.device_path}")
-    print()
-    
-    # Look for Keychron devices
-    if manufacturer and 'keychron' in manufacturer.lower():
-        keychron_devices.append(device)
+# Print all devices (built up and written once rather than per line)
+DEVICE_FMT = (
+    "VID: 0x%04X  PID: 0x%04X\n"
+    "  Manufacturer: %s\n"
+    "  Product: %s\n"
+    "  Path: %s\n"
+)
+print("\n".join([DEVICE_FMT % d for d in all_devices]))
 
 print("=" * 80)
 
 if keychron_devices:
     print(f"\nFound {len(keychron_devices)} Keychron device(s):")
-    for device in keychron_devices:
-        print(f"  VID: 0x{device.vendor_id:04X}, PID: 0x{device.product_id:04X}")
-        print(f"  Product: {device.product_name}")
-        print(f"  Path: {device.device_path}")
+    for vid, pid, manufacturer, product, path in keychron_devices:
+        print(f"  VID: 0x{vid:04X}, PID: 0x{pid:04X}")
+        print(f"  Product: {product}")
+        print(f"  Path: {path}")
         print()
     
-    print("\nUpdate hid_test.py with these values:")
-    device = keychron_devices[0]
-    print(f"VENDOR_ID = 0x{device.vendor_id:04X}")
-    print(f"PRODUCT_ID = 0x{device.product_id:04X}")
+    print("\nUpdate keychron_hid.py with these values:")
+    vid, pid = keychron_devices[0][:2]
+    print(f"VENDOR_ID = 0x{vid:04X}")
+    print(f"PRODUCT_ID = 0x{pid:04X}")
 else:
     print("\nNo Keychron devices found!")
     print("Make sure keyboard is plugged in and custom firmware is flashed.")
@@ -0,0 +1,74 @@
+"""
+Bounded log ring drained by a background thread
+
+Hot paths (HID reader, event loop) push (level, fmt, args) tuples instead
+of calling print() or logging directly, so they never take the stdout or
+handler locks and never format a message. A low-priority daemon thread
+drains the ring and hands each entry to a logger.
+
+Pushing is a single deque.append, which is atomic in CPython, so any
+number of threads may push. When the ring is full the oldest entry is
+dropped and counted.
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Optional
+
+
+class LogRing:
+    """Fixed-capacity queue of unformatted log entries, fed to a logger by a drainer thread"""
+
+    def __init__(self, logger: logging.Logger, size: int = 1024, interval: float = 0.05):
+        self.logger = logger
+        self.interval = interval
+        self._entries = deque(maxlen=size)  # Full deque drops from the left
+        self._size = size
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.dropped = 0  # Entries overwritten before they were drained
+
+    def push(self, level: int, fmt: str, *args):
+        """Queue a message; formatting is deferred to the drainer"""
+        entries = self._entries
+        if len(entries) == self._size:
+            self.dropped += 1
+        entries.append((level, fmt, args))
+
+    def start(self):
+        """Start the drainer thread (no-op if already running)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._drain_worker, name="LogRing", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        """Stop the drainer thread after flushing what is queued"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def flush(self):
+        """Hand every queued entry to the logger (drainer thread or after stop)"""
+        entries = self._entries
+        logger = self.logger
+        while entries:
+            try:
+                level, fmt, args = entries.popleft()
+            except IndexError:
+                break
+            if logger.isEnabledFor(level):
+                logger.log(level, fmt, *args)
+
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            logger.warning("Log ring overflowed, %s message(s) dropped", dropped)
+
+    def _drain_worker(self):
+        """Drainer thread - wakes periodically so producers never signal"""
+        while not self._stop.wait(self.interval):
+            self.flush()
@@ -10,12 +10,14 @@ Architecture:
 """
 
 import time
-import threading
 from enum import Enum, auto
 from dataclasses import dataclass
-from typing import Optional, Callable, List, Dict, Any
+from typing import Optional, Callable, Iterable, List, Dict, Any, Tuple
 from abc import ABC, abstractmethod
 
+from deadline_timer import DeadlineTimer
+from led_feedback import LEDTheme, MODE_COLORS
+
 
 # ============================================================================
 # CONFIGURATION
@@ -84,6 +86,15 @@ class MenuMode(Enum):
     CONTEXT_MENU = auto()          # Context-specific commands
 
 
+# Bake each mode's LED color onto the member so a mode switch is one attribute read
+for _mode in MenuMode:
+    _mode.led_color = MODE_COLORS.get(_mode.name, LEDTheme.NORMAL)
+del _mode
+
+# Size of the per-mode lookup tables indexed by MenuMode.value
+_MODE_SLOTS = max(m.value for m in MenuMode) + 1
+
+
 @dataclass
 class AppState:
     """Application state container"""
@@ -91,11 +102,10 @@ class AppState:
     previous_command: int = 0       # Previous command
     menu_mode: MenuMode = MenuMode.NORMAL
     submenu_index: int = 0          # Current submenu selection
-    last_click_time: float = 0      # For double-click detection
+    last_click_time: int = 0        # time.monotonic_ns() of last click, for double-click detection
     click_count: int = 0            # Click counter
-    last_rotation_index: int = 0    # Last command index for direction detection
     routing_selection: int = 0      # For routing modes: 0=A1, 1=A2, 2=A3
-    menu_timer: Optional[float] = None  # Timestamp for auto-exit
+    menu_timer: Optional[float] = None  # time.monotonic() deadline for auto-exit
     window_list: List[Any] = None   # Cached window list
 
     def __post_init__(self):
@@ -127,6 +137,12 @@ class CommandRegistry:
         self.commands.append(cmd)
         return len(self.commands) - 1
 
+    def register_many(self, items: Iterable[Tuple[str, str, Callable[[], None]]]) -> range:
+        """Register (name, description, action) tuples in one batch and return their indices"""
+        start = len(self.commands)
+        self.commands.extend(Command(name, description, action) for name, description, action in items)
+        return range(start, len(self.commands))
+
     def get(self, index: int) -> Optional[Command]:
         """Get command by index"""
         if 0 <= index < len(self.commands):
@@ -185,14 +201,18 @@ class MenuStateMachine:
     def __init__(self):
         self.state = AppState()
         self.commands = CommandRegistry()
-        self.mode_handlers: Dict[MenuMode, ModeHandler] = {}
+        # Indexed by MenuMode.value (auto() values are contiguous from 1)
+        self.mode_handlers: List[Optional[ModeHandler]] = [None] * _MODE_SLOTS
         self.ui_callback: Optional[Callable[[Dict[str, str]], None]] = None
         self.notification_callback: Optional[Callable[[str, int], None]] = None
-        self.single_click_timer: Optional[threading.Timer] = None
+        self.timer_armed_callback: Optional[Callable[[], None]] = None
+        self.led = None  # LEDFeedback, attached by the app once the keyboard is connected
+        # Fires the single-click action once the double-click window passes
+        self.single_click_timer = DeadlineTimer(self._execute_single_click, name="SingleClick")
 
     def register_mode_handler(self, mode: MenuMode, handler: ModeHandler):
         """Register a handler for a specific mode"""
-        self.mode_handlers[mode] = handler
+        self.mode_handlers[mode.value] = handler
 
     def set_ui_callback(self, callback: Callable[[Dict[str, str]], None]):
         """Set callback for UI updates"""
@@ -206,6 +226,10 @@ class MenuStateMachine:
         """Set callback for notifications"""
         self.notification_callback = callback
 
+    def set_timer_armed_callback(self, callback: Callable[[], None]):
+        """Set callback for when the auto-exit timer goes from idle to running"""
+        self.timer_armed_callback = callback
+
     def show_notification(self, message: str, duration: int = None):
         """Show notification via callback"""
         if self.notification_callback:
@@ -244,52 +268,61 @@ class MenuStateMachine:
             #     self.notification_callback(cmd.name, Config.NOTIFICATION_DURATION)
         else:
             # Show menu overlay
-            handler = self.mode_handlers.get(self.state.menu_mode)
+            handler = self.mode_handlers[self.state.menu_mode.value]
             if handler and self.ui_callback:
                 display = handler.get_display_text(self.state)
                 self.ui_callback(display)
 
     def reset_menu_timer(self):
         """Reset the auto-exit timer"""
-        self.state.menu_timer = time.time()
+        armed = self.state.menu_timer is None
+        self.state.menu_timer = time.monotonic() + Config.MENU_TIMEOUT_MS / 1000
+        # Lets the app poll for the timeout only while one is pending
+        if armed and self.timer_armed_callback:
+            self.timer_armed_callback()
 
     def check_menu_timeout(self) -> bool:
         """Check if menu should auto-exit"""
-        # Allow timeout in all modes
-        if self.state.menu_timer is None:
-            return False
+        # Allow timeout in all modes; the deadline is computed on activity,
+        # so each tick is a single comparison
+        deadline = self.state.menu_timer
+        return deadline is not None and time.monotonic() >= deadline
 
-        elapsed = (time.time() - self.state.menu_timer) * 1000
-        return elapsed > Config.MENU_TIMEOUT_MS
+    def enter_mode(self, mode: MenuMode, show: bool = True):
+        """Transition to a new mode
 
-    def enter_mode(self, mode: MenuMode):
-        """Transition to a new mode"""
+        Args:
+            mode: Mode to enter
+            show: Push the new mode's display; callers that immediately
+                  show something else (a notification) pass False
+        """
         # Exit current mode
-        old_handler = self.mode_handlers.get(self.state.menu_mode)
+        old_handler = self.mode_handlers[self.state.menu_mode.value]
         if old_handler:
             old_handler.on_exit(self.state)
 
         # Update state
         self.state.menu_mode = mode
         self.state.click_count = 0
-        self.state.last_rotation_index = 0
         self.reset_menu_timer()
 
         # Enter new mode
-        new_handler = self.mode_handlers.get(mode)
+        new_handler = self.mode_handlers[mode.value]
         if new_handler:
             new_handler.on_enter(self.state)
 
         # Trigger LED update if available
-        if hasattr(self, 'led') and self.led:
-            self.led.set_mode_color(mode.name)
+        if self.led:
+            self.led.set_mode_color(mode)
 
-        self.update_display()
+        if show:
+            self.update_display()
 
     def exit_menu_mode(self):
         """Exit to normal mode"""
         if self.state.menu_mode != MenuMode.NORMAL:
-            self.enter_mode(MenuMode.NORMAL)
+            # One UI update: the notification replaces the main menu wheel anyway
+            self.enter_mode(MenuMode.NORMAL, show=False)
             self.show_notification("Returned to Normal Mode", Config.NOTIFICATION_DURATION)
         else:
             # Already in NORMAL mode - just hide the UI
@@ -300,7 +333,7 @@ class MenuStateMachine:
     def _execute_single_click(self):
         """Execute single click action after delay"""
         self.state.click_count = 0
-        handler = self.mode_handlers.get(self.state.menu_mode)
+        handler = self.mode_handlers[self.state.menu_mode.value]
         if handler:
             handler.on_press(self.state)
             self.update_display()
@@ -310,31 +343,29 @@ class MenuStateMachine:
     # EVENT HANDLERS
     # ========================================================================
 
-    def handle_rotation(self, command_index: int):
+    def handle_rotation_delta(self, delta: int):
         """Handle rotation event
 
         Args:
-            command_index: The command index (0-3) from firmware
-                          Sequence determines direction (0→1→2→3→0 = CW)
+            delta: Signed step count. Positive moves the command cursor
+                   forward and is clockwise for mode handlers.
         """
         if self.state.menu_mode == MenuMode.NORMAL:
-            # Normal mode: Update command selection
-            self.state.previous_command = self.state.current_command
-            self.state.current_command = command_index
+            # Normal mode: Move command selection (the cursor wraps)
+            count = self.commands.count()
+            if count:
+                self.state.previous_command = self.state.current_command
+                self.state.current_command = (self.state.current_command + delta) % count
             self.update_display()
             # Reset timer in normal mode too (for auto-hide)
             self.reset_menu_timer()
         else:
-            # Menu mode: Determine rotation direction and delegate to handler
-            clockwise = self._is_rotating_clockwise(
-                self.state.last_rotation_index,
-                command_index
-            )
-            self.state.last_rotation_index = command_index
-
-            handler = self.mode_handlers.get(self.state.menu_mode)
+            # Menu mode: Delegate each step to the handler
+            handler = self.mode_handlers[self.state.menu_mode.value]
             if handler:
-                handler.on_rotation(self.state, clockwise)
+                clockwise = delta > 0
+                for _ in range(abs(delta)):
+                    handler.on_rotation(self.state, clockwise)
                 self.update_display()
                 self.reset_menu_timer()
 
@@ -361,15 +392,13 @@ class MenuStateMachine:
                     self.show_notification(f"Error: {e}", Config.ERROR_DURATION)
         else:
             # Menu mode: Single click - delegate to handler
-            current_time = time.time() * 1000  # Convert to ms
+            current_time = time.monotonic_ns()
             time_since_last = current_time - self.state.last_click_time
             
             # Cancel pending single click if any
-            if self.single_click_timer:
-                self.single_click_timer.cancel()
-                self.single_click_timer = None
+            self.single_click_timer.cancel()
 
-            if time_since_last < Config.DOUBLE_CLICK_MS:
+            if time_since_last < Config.DOUBLE_CLICK_MS * 1_000_000:
                 # Click came within threshold
                 self.state.click_count += 1
 
@@ -386,11 +415,7 @@ class MenuStateMachine:
 
             # Schedule single click execution
             if self.state.click_count == 1:
-                self.single_click_timer = threading.Timer(
-                    Config.DOUBLE_CLICK_MS / 1000.0, 
-                    self._execute_single_click
-                )
-                self.single_click_timer.start()
+                self.single_click_timer.start(Config.DOUBLE_CLICK_MS / 1000.0)
 
     def handle_long_press(self):
         """Handle long press event"""
@@ -400,21 +425,6 @@ class MenuStateMachine:
     def handle_double_tap(self):
         """Handle double tap event (from firmware)"""
         # Cancel any pending single click timer to prevent it from firing
-        if self.single_click_timer:
-            self.single_click_timer.cancel()
-            self.single_click_timer = None
+        self.single_click_timer.cancel()
         if self.state.menu_mode != MenuMode.NORMAL:
             self.exit_menu_mode()
-
-    @staticmethod
-    def _is_rotating_clockwise(prev_index: int, curr_index: int) -> bool:
-        """Determine rotation direction from command sequence
-
-        Normal increment: 0->1, 1->2, 2->3
-        Wrap around: 3->0
-        """
-        if curr_index == prev_index + 1:
-            return True
-        if prev_index == 3 and curr_index == 0:
-            return True
-        return False
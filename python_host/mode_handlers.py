@@ -9,11 +9,39 @@ Each handler implements:
 - get_display_text: Return text for overlay UI
 """
 
-from menu_system import ModeHandler, AppState, MenuMode
+from menu_system import ModeHandler, AppState, MenuMode, Config
+from deadline_timer import DeadlineTimer
 from windows_api import SystemAPI
-from typing import Dict
+from typing import Dict, List, Optional
+import json
+import os
 import time
-import threading
+
+
+def _wheel_display(names, index: int, **extra) -> Dict[str, str]:
+    """Display for a wrapping list: neighbours on the sides, selection in the center"""
+    total = len(names)
+    display = {
+        'left': names[(index - 1) % total],
+        'center': f"▶ {names[index]}",
+        'right': names[(index + 1) % total],
+    }
+    display.update(extra)
+    return display
+
+
+# Strip gain bar spans -60 to +12 dB
+_INV_GAIN_RANGE = 1.0 / 72.0
+
+
+def _gain_progress(gain: int) -> float:
+    """Strip gain in dB as a 0-1 progress value"""
+    progress = (gain + 60) * _INV_GAIN_RANGE
+    if progress < 0.0:
+        return 0.0
+    if progress > 1.0:
+        return 1.0
+    return progress
 
 
 # ============================================================================
@@ -27,26 +55,19 @@ class MediaModeHandler(ModeHandler):
         self.api = api
         self.sm = state_machine
         self.last_active = -1
-        self.reset_timer: threading.Timer = None
+        self.reset_timer = DeadlineTimer(self._reset_active, name="MediaHighlight")
 
     def on_enter(self, state: AppState):
         self.last_active = -1
-        if self.reset_timer:
-            self.reset_timer.cancel()
+        self.reset_timer.cancel()
 
     def on_exit(self, state: AppState):
-        if self.reset_timer:
-            self.reset_timer.cancel()
+        self.reset_timer.cancel()
 
     def _trigger_highlight(self, index: int):
         """Highlight an item briefly"""
         self.last_active = index
-        
-        if self.reset_timer:
-            self.reset_timer.cancel()
-            
-        self.reset_timer = threading.Timer(0.5, self._reset_active)
-        self.reset_timer.start()
+        self.reset_timer.start(0.5)  # Re-arming pushes back a pending reset
 
     def _reset_active(self):
         """Reset highlight to neutral"""
@@ -68,16 +89,23 @@ class MediaModeHandler(ModeHandler):
         self.api.media.play_pause()
         self._trigger_highlight(1)
 
-    def get_display_text(self, state: AppState) -> Dict[str, str]:
-        return {
+    # One display per highlight state (-1 = none, 0-2 = segment); the UI only
+    # reads display dicts, so these are shared rather than rebuilt per refresh
+    _DISPLAYS = {
+        active: {
             'left': 'Previous Track',
             'center': 'Play/Pause',
             'right': 'Next Track',
             'title': '',
             'icons': {'left': '⏮', 'center': '⏯', 'right': '⏭'},
-            'active_index': self.last_active,
-            'pulsing': self.last_active != -1
+            'active_index': active,
+            'pulsing': active != -1
         }
+        for active in (-1, 0, 1, 2)
+    }
+
+    def get_display_text(self, state: AppState) -> Dict[str, str]:
+        return self._DISPLAYS[self.last_active]
 
 
 # ============================================================================
@@ -90,9 +118,20 @@ class VolumeModeHandler(ModeHandler):
     def __init__(self, api: SystemAPI, volume_step: int = 2):
         self.api = api
         self.volume_step = volume_step
+        # Shadow of the system state, so display refreshes skip the COM calls
+        self._volume = 0
+        self._muted = False
+        self._displays: Dict[tuple, Dict] = {}  # (volume, muted) -> display, at most 202
+        self.refresh()
+
+    def refresh(self):
+        """Re-read volume and mute from the system"""
+        self._volume = self.api.volume.get_volume()
+        self._muted = self.api.volume.get_mute()
 
     def on_enter(self, state: AppState):
-        pass
+        # Pick up changes made outside the menu
+        self.refresh()
 
     def on_exit(self, state: AppState):
         pass
@@ -100,48 +139,53 @@ class VolumeModeHandler(ModeHandler):
     def on_rotation(self, state: AppState, clockwise: bool):
         """Rotate: Adjust volume"""
         # Clockwise brings left (Volume Down) to center, CCW brings right (Volume Up) to center
-        if clockwise:
-            self.api.volume.adjust_volume(-self.volume_step)
-        else:
-            self.api.volume.adjust_volume(self.volume_step)
+        step = -self.volume_step if clockwise else self.volume_step
+        # Step from the live level: media keys or the mixer may have moved it
+        self._volume = max(0, min(100, self.api.volume.get_volume() + step))
+        self.api.volume.set_volume(self._volume)
 
     def on_press(self, state: AppState):
         """Press: Toggle mute"""
-        self.api.volume.toggle_mute()
+        self._muted = not self.api.volume.get_mute()
+        self.api.volume.set_mute(self._muted)
 
     def get_display_text(self, state: AppState) -> Dict[str, str]:
-        volume = self.api.volume.get_volume()
-        muted = self.api.volume.get_mute()
-
-        return {
-            'left': 'Volume Down',
-            'center': f'{volume}%',
-            'right': 'Volume Up',
-            'title': '🔇 MUTED' if muted else '🔊 Volume',
-            'progress': volume / 100.0,
-            'icons': {'left': '−', 'center': '🔇' if muted else '🔊', 'right': '+'}
-        }
+        key = (self._volume, self._muted)
+        display = self._displays.get(key)
+        if display is None:
+            volume, muted = key
+            display = self._displays[key] = {
+                'left': 'Volume Down',
+                'center': f'{volume}%',
+                'right': 'Volume Up',
+                'title': '🔇 MUTED' if muted else '🔊 Volume',
+                'progress': volume / 100.0,
+                'icons': {'left': '−', 'center': '🔇' if muted else '🔊', 'right': '+'}
+            }
+        return display
 
 
 # ============================================================================
-# WINDOW MENU MODE (Submenu selector)
+# SUBMENU SELECTOR
 # ============================================================================
 
-class WindowMenuHandler(ModeHandler):
-    """Window manager submenu selector"""
+class SubmenuHandler(ModeHandler):
+    """Wheel of fixed items that either enter a mode or run an action
 
-    def __init__(self, state_machine):
-        self.sm = state_machine
-        self.submenus = [
-            {'name': 'Window Cycle', 'mode': MenuMode.WINDOW_CYCLE},
-            {'name': 'Window Snap', 'mode': MenuMode.WINDOW_SNAP},
-            {'name': 'Show Desktop', 'action': self._show_desktop}
-        ]
+    Items are {'name', 'mode'} or {'name', 'action'} dicts. Running an
+    action exits the menu.
+    """
 
-    def _show_desktop(self):
-        """Action: Show desktop"""
-        self.sm.api.windows.show_desktop()
-        self.sm.exit_menu_mode()
+    def __init__(self, state_machine, items, title: Optional[str] = None):
+        self.sm = state_machine
+        self.title = title
+        # Parallel tuples, so a press is two tuple indexes instead of dict lookups
+        self._names = tuple(item['name'] for item in items)
+        self._modes = tuple(item.get('mode') for item in items)
+        self._actions = tuple(item.get('action') for item in items)
+        # Items never change, so every display is built up front
+        extra = {'title': title} if title else {}
+        self._displays = tuple(_wheel_display(self._names, i, **extra) for i in range(len(self._names)))
 
     def on_enter(self, state: AppState):
         state.submenu_index = 0
@@ -150,32 +194,26 @@ class WindowMenuHandler(ModeHandler):
         pass
 
     def on_rotation(self, state: AppState, clockwise: bool):
-        """Rotate: Cycle through submenus"""
+        """Rotate: Cycle through items"""
         if clockwise:
-            state.submenu_index = (state.submenu_index + 1) % len(self.submenus)
+            state.submenu_index = (state.submenu_index + 1) % len(self._names)
         else:
-            state.submenu_index = (state.submenu_index - 1) % len(self.submenus)
+            state.submenu_index = (state.submenu_index - 1) % len(self._names)
 
     def on_press(self, state: AppState):
-        """Press: Execute selected submenu"""
-        submenu = self.submenus[state.submenu_index]
-        if 'mode' in submenu:
-            # Enter submenu mode
-            self.sm.enter_mode(submenu['mode'])
-        elif 'action' in submenu:
-            # Execute action
-            submenu['action']()
+        """Press: Enter the selected mode, or run the selected action and exit"""
+        i = state.submenu_index
+        mode = self._modes[i]
+        if mode is not None:
+            self.sm.enter_mode(mode)
+        else:
+            action = self._actions[i]
+            if action is not None:
+                action()
+                self.sm.exit_menu_mode()
 
     def get_display_text(self, state: AppState) -> Dict[str, str]:
-        total = len(self.submenus)
-        prev_idx = (state.submenu_index - 1) % total
-        next_idx = (state.submenu_index + 1) % total
-
-        return {
-            'left': self.submenus[prev_idx]['name'],
-            'center': f"▶ {self.submenus[state.submenu_index]['name']}",
-            'right': self.submenus[next_idx]['name']
-        }
+        return self._displays[state.submenu_index]
 
 
 # ============================================================================
@@ -185,13 +223,27 @@ class WindowMenuHandler(ModeHandler):
 class WindowCycleHandler(ModeHandler):
     """Alt-Tab like window cycling"""
 
+    # Re-entering within this window reuses the last EnumWindows snapshot
+    WINDOW_LIST_TTL_S = 0.25
+
     def __init__(self, api: SystemAPI):
         self.api = api
+        self._windows = None  # Last get_visible_windows() result
+        self._windows_at = 0.0  # time.monotonic() it was taken
+        self._short_titles: List[str] = []
+        self._displays: Dict[int, Dict] = {}  # submenu_index -> display, reset per list
 
     def on_enter(self, state: AppState):
         """Build window list"""
-        state.window_list = self.api.windows.get_visible_windows()
+        now = time.monotonic()
+        if self._windows is None or now - self._windows_at >= self.WINDOW_LIST_TTL_S:
+            self._windows = self.api.windows.get_visible_windows()
+            self._windows_at = now
+        state.window_list = self._windows
         state.submenu_index = 0
+        # Truncate titles once per list rather than on every render
+        self._short_titles = [w.title[:Config.WINDOW_TITLE_MAX_LEN] for w in self._windows]
+        self._displays = {}
 
     def on_exit(self, state: AppState):
         state.window_list = []
@@ -211,8 +263,9 @@ class WindowCycleHandler(ModeHandler):
         if state.window_list and 0 <= state.submenu_index < len(state.window_list):
             window = state.window_list[state.submenu_index]
             if self.api.windows.activate_window(window.hwnd):
+                # Z-order changed, so the snapshot is stale
+                self._windows = None
                 # Exit after successful switch
-                from menu_system import MenuMode
                 state.menu_mode = MenuMode.NORMAL
 
     def get_display_text(self, state: AppState) -> Dict[str, str]:
@@ -223,127 +276,28 @@ class WindowCycleHandler(ModeHandler):
                 'right': ''
             }
 
+        display = self._displays.get(state.submenu_index)
+        if display is not None:
+            return display
+
         if len(state.window_list) == 1:
-            title = state.window_list[0].title[:22]
-            return {
+            display = {
                 'left': '',
-                'center': f'▶ {title}',
+                'center': f'▶ {self._short_titles[0]}',
                 'right': ''
             }
-
-        # Multiple windows
-        total = len(state.window_list)
-        prev_idx = (state.submenu_index - 1) % total
-        next_idx = (state.submenu_index + 1) % total
-
-        prev_title = state.window_list[prev_idx].title[:22]
-        curr_title = state.window_list[state.submenu_index].title[:22]
-        next_title = state.window_list[next_idx].title[:22]
-
-        return {
-            'left': prev_title,
-            'center': f'▶ {curr_title}',
-            'right': next_title
-        }
-
-
-# ============================================================================
-# WINDOW SNAP MODE
-# ============================================================================
-
-class WindowSnapHandler(ModeHandler):
-    """Window snapping to screen edges"""
-
-    def __init__(self, api: SystemAPI, state_machine):
-        self.api = api
-        self.sm = state_machine
-        self.snap_options = [
-            {'name': '◧ Snap Left', 'action': api.windows.snap_window_left},
-            {'name': '◨ Snap Right', 'action': api.windows.snap_window_right},
-            {'name': '⬜ Maximize', 'action': api.windows.maximize_window}
-        ]
-
-    def on_enter(self, state: AppState):
-        state.submenu_index = 0
-
-    def on_exit(self, state: AppState):
-        pass
-
-    def on_rotation(self, state: AppState, clockwise: bool):
-        """Rotate: Cycle through snap options"""
-        if clockwise:
-            state.submenu_index = (state.submenu_index + 1) % len(self.snap_options)
         else:
-            state.submenu_index = (state.submenu_index - 1) % len(self.snap_options)
+            # Multiple windows
+            display = _wheel_display(self._short_titles, state.submenu_index)
 
-    def on_press(self, state: AppState):
-        """Press: Execute snap action and exit"""
-        option = self.snap_options[state.submenu_index]
-        option['action']()
-        # Exit after snapping
-        self.sm.exit_menu_mode()
-
-    def get_display_text(self, state: AppState) -> Dict[str, str]:
-        total = len(self.snap_options)
-        prev_idx = (state.submenu_index - 1) % total
-        next_idx = (state.submenu_index + 1) % total
-
-        return {
-            'left': self.snap_options[prev_idx]['name'],
-            'center': f"▶ {self.snap_options[state.submenu_index]['name']}",
-            'right': self.snap_options[next_idx]['name']
-        }
+        self._displays[state.submenu_index] = display
+        return display
 
 
 # ============================================================================
 # VOICEMEETER HANDLERS
 # ============================================================================
 
-class VoicemeeterMenuHandler(ModeHandler):
-    """Voicemeeter submenu selector"""
-
-    def __init__(self, state_machine, vm_controller):
-        self.sm = state_machine
-        self.vm = vm_controller
-        self.submenus = [
-            {'name': 'Microphone Control', 'mode': MenuMode.VM_MIC},
-            {'name': 'Main Routing', 'mode': MenuMode.VM_MAIN_ROUTING},
-            {'name': 'Music Gain', 'mode': MenuMode.VM_MUSIC_GAIN},
-            {'name': 'Music Routing', 'mode': MenuMode.VM_MUSIC_ROUTING},
-            {'name': 'Comm Gain', 'mode': MenuMode.VM_COMM_GAIN},
-            {'name': 'Comm Routing', 'mode': MenuMode.VM_COMM_ROUTING},
-        ]
-
-    def on_enter(self, state: AppState):
-        state.submenu_index = 0
-
-    def on_exit(self, state: AppState):
-        pass
-
-    def on_rotation(self, state: AppState, clockwise: bool):
-        """Rotate: Cycle through submenus"""
-        if clockwise:
-            state.submenu_index = (state.submenu_index + 1) % len(self.submenus)
-        else:
-            state.submenu_index = (state.submenu_index - 1) % len(self.submenus)
-
-    def on_press(self, state: AppState):
-        """Press: Enter selected submenu"""
-        submenu = self.submenus[state.submenu_index]
-        self.sm.enter_mode(submenu['mode'])
-
-    def get_display_text(self, state: AppState) -> Dict[str, str]:
-        total = len(self.submenus)
-        prev_idx = (state.submenu_index - 1) % total
-        next_idx = (state.submenu_index + 1) % total
-
-        return {
-            'left': self.submenus[prev_idx]['name'],
-            'center': f"▶ {self.submenus[state.submenu_index]['name']}",
-            'right': self.submenus[next_idx]['name']
-        }
-
-
 class VMMicHandler(ModeHandler):
     """Microphone Gain + Mute control (Strip 0)"""
 
@@ -351,6 +305,7 @@ class VMMicHandler(ModeHandler):
         self.vm = vm_controller
         self.strip = 0 # Strip 0 is Mic
         self.gain_step = 3.0
+        self._displays: Dict[tuple, Dict] = {}  # (gain, muted) -> display, at most 146
 
     def on_enter(self, state: AppState):
         pass
@@ -370,20 +325,19 @@ class VMMicHandler(ModeHandler):
         self.vm.toggle_mic_mute()
 
     def get_display_text(self, state: AppState) -> Dict[str, str]:
-        gain = round(self.vm.get_strip_gain(self.strip))
-        muted = self.vm.get_mic_mute()
-        
-        # Normalize gain to 0-1 range (-60 to +12 dB)
-        progress = (gain + 60) / 72.0
-
-        return {
-            'left': 'Gain Down',
-            'center': f'{gain} dB',
-            'right': 'Gain Up',
-            'title': '🎤 MIC MUTED' if muted else '🎤 Microphone',
-            'progress': max(0.0, min(1.0, progress)),
-            'icons': {'left': '−', 'center': '🔇' if muted else '🎤', 'right': '+'}
-        }
+        key = (round(self.vm.get_strip_gain(self.strip)), self.vm.get_mic_mute())
+        display = self._displays.get(key)
+        if display is None:
+            gain, muted = key
+            display = self._displays[key] = {
+                'left': 'Gain Down',
+                'center': f'{gain} dB',
+                'right': 'Gain Up',
+                'title': '🎤 MIC MUTED' if muted else '🎤 Microphone',
+                'progress': _gain_progress(gain),
+                'icons': {'left': '−', 'center': '🔇' if muted else '🎤', 'right': '+'}
+            }
+        return display
 
 
 class VMRoutingHandler(ModeHandler):
@@ -396,9 +350,25 @@ class VMRoutingHandler(ModeHandler):
         self.outputs = ['A1', 'A2', 'A3']
         self.output_names = ['Speakers', 'Wired', 'Wireless']
         self.output_icons = ['🔊', '🎧', '📡']
+        self._routing_cache = None  # Routing per output, read once per change
+        self._routing_dirty = True
+        # Re-reads routing once a toggle has had time to propagate
+        self._resync = DeadlineTimer(self._mark_dirty, name=f"VMRoutingResync-{strip}")
+
+    def _mark_dirty(self):
+        """Timer callback: fetch routing from Voicemeeter on the next render"""
+        self._routing_dirty = True
+
+    def _routing(self) -> tuple:
+        """Current routing per output, re-read from Voicemeeter only when dirty"""
+        if self._routing_dirty:
+            self._routing_cache = tuple(self.vm.get_routing(self.strip, out) for out in self.outputs)
+            self._routing_dirty = False
+        return self._routing_cache
 
     def on_enter(self, state: AppState):
         state.routing_selection = 0  # Start at A1
+        self._routing_dirty = True  # May have changed outside the menu
 
     def on_exit(self, state: AppState):
         pass
@@ -409,17 +379,21 @@ class VMRoutingHandler(ModeHandler):
             state.routing_selection = (state.routing_selection + 1) % 3
         else:
             state.routing_selection = (state.routing_selection - 1) % 3
-        time.sleep(0.03)  # Brief delay for smooth display
 
     def on_press(self, state: AppState):
         """Press: Toggle selected output"""
-        output = self.outputs[state.routing_selection]
-        self.vm.toggle_routing(self.strip, output)
-        time.sleep(0.05)  # Wait for update
+        sel = state.routing_selection
+        routing = list(self._routing())
+        routing[sel] = not routing[sel]
+        self.vm.set_routing(self.strip, self.outputs[sel], routing[sel])
+        # Show the new state right away; Voicemeeter may still report the old
+        # value for a moment, so confirm it with a deferred re-read
+        self._routing_cache = tuple(routing)
+        self._resync.start(0.1)
 
     def get_display_text(self, state: AppState) -> Dict[str, str]:
         # Get current routing states
-        states = [self.vm.get_routing(self.strip, out) for out in self.outputs]
+        states = self._routing()
 
         prev_idx = (state.routing_selection - 1) % 3
         next_idx = (state.routing_selection + 1) % 3
@@ -449,6 +423,7 @@ class VMGainHandler(ModeHandler):
         self.strip_name = strip_name
         self.icon = icon
         self.gain_step = 3.0
+        self._displays: Dict[int, Dict] = {}  # gain -> display, at most 73
 
     def on_enter(self, state: AppState):
         pass
@@ -470,82 +445,34 @@ class VMGainHandler(ModeHandler):
 
     def get_display_text(self, state: AppState) -> Dict[str, str]:
         gain = round(self.vm.get_strip_gain(self.strip))
-        # Normalize gain to 0-1 range (assuming -60 to +12 dB range)
-        progress = (gain + 60) / 72.0
-
-        return {
-            'left': 'Gain Down',
-            'center': f'{gain} dB',
-            'right': 'Gain Up',
-            'title': f'{self.icon} {self.strip_name} Gain',
-            'progress': max(0.0, min(1.0, progress)),
-            'icons': {'left': '−', 'center': self.icon, 'right': '+'}
-        }
-
+        display = self._displays.get(gain)
+        if display is None:
+            display = self._displays[gain] = {
+                'left': 'Gain Down',
+                'center': f'{gain} dB',
+                'right': 'Gain Up',
+                'title': f'{self.icon} {self.strip_name} Gain',
+                'progress': _gain_progress(gain),
+                'icons': {'left': '−', 'center': self.icon, 'right': '+'}
+            }
+        return display
 
-import json
-import os
 
 # ============================================================================
 # THEME SELECTION MODE
 # ============================================================================
 
-class ThemeMenuHandler(ModeHandler):
-    """Theme submenu selector"""
-
-    def __init__(self, state_machine):
-        self.sm = state_machine
-        self.submenus = [
-            {'name': 'Presets', 'mode': MenuMode.THEME_PRESET},
-            {'name': 'Box Color', 'mode': MenuMode.THEME_BOX},
-            {'name': 'Accent Color', 'mode': MenuMode.THEME_ACCENT},
-            {'name': 'Glow Color', 'mode': MenuMode.THEME_GLOW},
-            {'name': 'Text Color', 'mode': MenuMode.THEME_TEXT},
-        ]
-
-    def on_enter(self, state: AppState):
-        state.submenu_index = 0
-
-    def on_exit(self, state: AppState):
-        pass
-
-    def on_rotation(self, state: AppState, clockwise: bool):
-        """Cycle submenus"""
-        if clockwise:
-            state.submenu_index = (state.submenu_index + 1) % len(self.submenus)
-        else:
-            state.submenu_index = (state.submenu_index - 1) % len(self.submenus)
-
-    def on_press(self, state: AppState):
-        """Enter selected submenu"""
-        submenu = self.submenus[state.submenu_index]
-        self.sm.enter_mode(submenu['mode'])
-
-    def get_display_text(self, state: AppState) -> Dict[str, str]:
-        total = len(self.submenus)
-        prev_idx = (state.submenu_index - 1) % total
-        next_idx = (state.submenu_index + 1) % total
-
-        return {
-            'left': self.submenus[prev_idx]['name'],
-            'center': f"▶ {self.submenus[state.submenu_index]['name']}",
-            'right': self.submenus[next_idx]['name'],
-            'title': '🎨 Theme Settings'
-        }
-
-
 class ThemePresetHandler(ModeHandler):
     """Select from available theme presets"""
 
     def __init__(self, state_machine):
         self.sm = state_machine
         self.themes = []
+        self._displays: Dict[int, Dict] = {}  # submenu_index -> display, reset on reload
         self._load_theme_list()
 
     def _load_theme_list(self):
         """Load available themes from themes.json"""
-        import json
-        import os
         try:
             theme_file = os.path.join(os.path.dirname(__file__), 'themes.json')
             if os.path.exists(theme_file):
@@ -556,6 +483,7 @@ class ThemePresetHandler(ModeHandler):
                 self.themes = ['DARK', 'LIGHT', 'CYBER']
         except:
             self.themes = ['DARK', 'LIGHT', 'CYBER']
+        self._displays = {}
 
     def on_enter(self, state: AppState):
         self._load_theme_list()
@@ -582,43 +510,52 @@ class ThemePresetHandler(ModeHandler):
         self.sm.ui_callback({'set_theme': theme_name})
         
         self.sm.show_notification(f"Theme: {theme_name}", 1000)
-        from menu_system import MenuMode
         self.sm.enter_mode(MenuMode.THEME_MENU)
 
     def get_display_text(self, state: AppState) -> Dict[str, str]:
         if not self.themes:
             return {'center': 'No Themes', 'left': '', 'right': '', 'title': 'Error'}
 
-        total = len(self.themes)
-        prev_idx = (state.submenu_index - 1) % total
-        next_idx = (state.submenu_index + 1) % total
-        
-        curr_theme = self.themes[state.submenu_index]
-
-        # Preview the theme instantly (Preview only, no save)
-        return {
-            'left': self.themes[prev_idx],
-            'center': f"▶ {curr_theme}",
-            'right': self.themes[next_idx],
-            'title': '🎨 Select Theme',
-            'preview_theme': curr_theme 
-        }
+        display = self._displays.get(state.submenu_index)
+        if display is None:
+            # Preview the theme instantly (Preview only, no save)
+            display = self._displays[state.submenu_index] = _wheel_display(
+                self.themes, state.submenu_index,
+                title='🎨 Select Theme',
+                preview_theme=self.themes[state.submenu_index])
+        return display
 
 
 class ThemeColorHandler(ModeHandler):
     """Color picker for theme elements"""
 
-    COLORS = [
+    COLORS = (
         ("White", "#FFFFFF"), ("Red", "#FF0000"), ("Green", "#00FF00"), 
         ("Blue", "#0088FF"), ("Yellow", "#FFFF00"), ("Cyan", "#00FFFF"), 
         ("Magenta", "#FF00FF"), ("Orange", "#FFA500"), ("Purple", "#800080"), 
         ("Black", "#000000"), ("Gray", "#808080"), ("Dark Gray", "#2d2d2d")
-    ]
+    )
+    COLOR_NAMES = tuple(name for name, _ in COLORS)
+
+    # Theme keys each color type writes
+    THEME_KEYS = {
+        'box': ('segment_inactive', 'progress_bg'),
+        'accent': ('segment_active', 'accent', 'accent_glow', 'progress_fill', 'border', 'glow'),
+        'glow': ('glow', 'accent_glow'),
+        'text': ('text_active',),
+    }
 
     def __init__(self, color_type: str):
         self.color_type = color_type
         self.current_idx = 0
         self.should_save = False
+        # The palette is fixed, so every display (and its theme update) is built up front
+        keys = self.THEME_KEYS.get(color_type, ())
+        title = f'🎨 {color_type.title()} Color'
+        self._displays = tuple(
+            _wheel_display(self.COLOR_NAMES, i, title=title, set_theme_color=dict.fromkeys(keys, hex_code))
+            for i, (_, hex_code) in enumerate(self.COLORS)
+        )
 
     def on_enter(self, state: AppState):
         self.current_idx = 0
@@ -637,50 +574,17 @@ class ThemeColorHandler(ModeHandler):
     def on_press(self, state: AppState):
         """Confirm and Save"""
         self.should_save = True
-        from menu_system import MenuMode
         state.menu_mode = MenuMode.THEME_MENU
 
     def get_display_text(self, state: AppState) -> Dict[str, str]:
-        total = len(self.COLORS)
-        prev_idx = (self.current_idx - 1) % total
-        next_idx = (self.current_idx + 1) % total
-        
-        prev_name, _ = self.COLORS[prev_idx]
-        curr_name, hex_code = self.COLORS[self.current_idx]
-        next_name, _ = self.COLORS[next_idx]
-        
-        # Build theme update dictionary
-        settings = {}
-        if self.color_type == 'box':
-            settings = {'segment_inactive': hex_code, 'progress_bg': hex_code}
-        elif self.color_type == 'accent':
-            settings = {
-                'segment_active': hex_code, 
-                'accent': hex_code, 
-                'accent_glow': hex_code,
-                'progress_fill': hex_code,
-                'border': hex_code,
-                'glow': hex_code
-            }
-        elif self.color_type == 'glow':
-            settings = {'glow': hex_code, 'accent_glow': hex_code}
-        elif self.color_type == 'text':
-            settings = {'text_active': hex_code}
-
-        res = {
-            'left': prev_name,
-            'center': f"▶ {curr_name}",
-            'right': next_name,
-            'title': f'🎨 {self.color_type.title()} Color',
-            'set_theme_color': settings
-        }
+        res = self._displays[self.current_idx]
 
         if self.should_save:
             # We don't know the exact theme name here easily, 
             # but we can save to 'CUSTOM' or the currently active one.
             # For simplicity, let's assume the user is updating the current active theme.
             # In keychron_app.py we can pass the theme name or just have it save the current.
-            res['save_theme'] = 'CUSTOM' 
+            res = dict(res, save_theme='CUSTOM')
             self.should_save = False
             
         return res
@@ -690,6 +594,25 @@ class ThemeColorHandler(ModeHandler):
 # HANDLER FACTORY
 # ============================================================================
 
+# Menus that only enter other modes; those with actions are built per api
+THEME_MENU_ITEMS = (
+    {'name': 'Presets', 'mode': MenuMode.THEME_PRESET},
+    {'name': 'Box Color', 'mode': MenuMode.THEME_BOX},
+    {'name': 'Accent Color', 'mode': MenuMode.THEME_ACCENT},
+    {'name': 'Glow Color', 'mode': MenuMode.THEME_GLOW},
+    {'name': 'Text Color', 'mode': MenuMode.THEME_TEXT},
+)
+
+VOICEMEETER_MENU_ITEMS = (
+    {'name': 'Microphone Control', 'mode': MenuMode.VM_MIC},
+    {'name': 'Main Routing', 'mode': MenuMode.VM_MAIN_ROUTING},
+    {'name': 'Music Gain', 'mode': MenuMode.VM_MUSIC_GAIN},
+    {'name': 'Music Routing', 'mode': MenuMode.VM_MUSIC_ROUTING},
+    {'name': 'Comm Gain', 'mode': MenuMode.VM_COMM_GAIN},
+    {'name': 'Comm Routing', 'mode': MenuMode.VM_COMM_ROUTING},
+)
+
+
 def create_handlers(api: SystemAPI, state_machine, vm_controller=None) -> Dict[MenuMode, ModeHandler]:
     """Create all mode handlers
 
@@ -701,18 +624,27 @@ def create_handlers(api: SystemAPI, state_machine, vm_controller=None) -> Dict[M
     Returns:
         Dict mapping MenuMode to ModeHandler instance
     """
+    windows = api.windows
     handlers = {
         MenuMode.MEDIA: MediaModeHandler(api, state_machine),
         MenuMode.VOLUME: VolumeModeHandler(api),
-        MenuMode.THEME_MENU: ThemeMenuHandler(state_machine),
+        MenuMode.THEME_MENU: SubmenuHandler(state_machine, THEME_MENU_ITEMS, title='🎨 Theme Settings'),
         MenuMode.THEME_PRESET: ThemePresetHandler(state_machine),
         MenuMode.THEME_BOX: ThemeColorHandler('box'),
         MenuMode.THEME_ACCENT: ThemeColorHandler('accent'),
         MenuMode.THEME_GLOW: ThemeColorHandler('glow'),
         MenuMode.THEME_TEXT: ThemeColorHandler('text'),
-        MenuMode.WINDOW_MENU: WindowMenuHandler(state_machine),
+        MenuMode.WINDOW_MENU: SubmenuHandler(state_machine, [
+            {'name': 'Window Cycle', 'mode': MenuMode.WINDOW_CYCLE},
+            {'name': 'Window Snap', 'mode': MenuMode.WINDOW_SNAP},
+            {'name': 'Show Desktop', 'action': windows.show_desktop},
+        ]),
         MenuMode.WINDOW_CYCLE: WindowCycleHandler(api),
-        MenuMode.WINDOW_SNAP: WindowSnapHandler(api, state_machine),
+        MenuMode.WINDOW_SNAP: SubmenuHandler(state_machine, [
+            {'name': '◧ Snap Left', 'action': windows.snap_window_left},
+            {'name': '◨ Snap Right', 'action': windows.snap_window_right},
+            {'name': '⬜ Maximize', 'action': windows.maximize_window},
+        ]),
     }
 
     # Add Voicemeeter handlers if available
@@ -721,7 +653,7 @@ def create_handlers(api: SystemAPI, state_machine, vm_controller=None) -> Dict[M
         config = VoicemeeterConfig()
 
         handlers.update({
-            MenuMode.VOICEMEETER_MENU: VoicemeeterMenuHandler(state_machine, vm_controller),
+            MenuMode.VOICEMEETER_MENU: SubmenuHandler(state_machine, VOICEMEETER_MENU_ITEMS),
             MenuMode.VM_MIC: VMMicHandler(vm_controller),
             MenuMode.VM_MAIN_ROUTING: VMRoutingHandler(vm_controller, config.MAIN_STRIP, "Main"),
             MenuMode.VM_MUSIC_GAIN: VMGainHandler(vm_controller, config.MUSIC_STRIP, "Music", "🎵"),
@@ -14,6 +14,7 @@ import math
 import json
 import os
 import ctypes
+from functools import lru_cache
 from typing import Dict, Optional, List
 from dataclasses import dataclass
 
@@ -27,7 +28,7 @@ from PyQt6.QtCore import (
 from PyQt6.QtGui import (
     QPainter, QPainterPath, QColor, QBrush, QPen,
     QRadialGradient, QLinearGradient, QFont, QFontDatabase,
-    QCursor, QTextOption
+    QCursor, QTextOption, QPixmap
 )
 
 
@@ -64,31 +65,38 @@ class ThemeColors:
     glow: str = "#3d8aff"
 
 
+THEME_FILE = os.path.join(os.path.dirname(__file__), 'themes.json')
+
+
+@lru_cache(maxsize=1)
+def _read_themes() -> Dict[str, dict]:
+    """Parse themes.json once; save_theme() invalidates the cache (treat as read-only)"""
+    if os.path.exists(THEME_FILE):
+        with open(THEME_FILE, 'r') as f:
+            return json.load(f)
+    return {}
+
+
 def load_theme(theme_name: str) -> ThemeColors:
     """Load theme from themes.json"""
-    theme_file = os.path.join(os.path.dirname(__file__), 'themes.json')
-    if os.path.exists(theme_file):
-        try:
-            with open(theme_file, 'r') as f:
-                themes = json.load(f)
-                if theme_name in themes:
-                    data = themes[theme_name]
-                    return ThemeColors(**{k: v for k, v in data.items() if hasattr(ThemeColors, k)})
-        except Exception as e:
-            print(f"Error loading theme: {e}")
+    try:
+        themes = _read_themes()
+        if theme_name in themes:
+            data = themes[theme_name]
+            return ThemeColors(**{k: v for k, v in data.items() if hasattr(ThemeColors, k)})
+    except Exception as e:
+        print(f"Error loading theme: {e}")
     return ThemeColors()
 
 
 def save_theme(theme_name: str, colors: ThemeColors):
     """Save theme to themes.json"""
-    theme_file = os.path.join(os.path.dirname(__file__), 'themes.json')
+    theme_file = THEME_FILE
     themes = {}
-    if os.path.exists(theme_file):
-        try:
-            with open(theme_file, 'r') as f:
-                themes = json.load(f)
-        except:
-            pass
+    try:
+        themes = dict(_read_themes())
+    except:
+        pass
 
     themes[theme_name] = {
         'bg': colors.bg,
@@ -110,6 +118,8 @@ def save_theme(theme_name: str, colors: ThemeColors):
             json.dump(themes, f, indent=4)
     except Exception as e:
         print(f"Error saving theme: {e}")
+    finally:
+        _read_themes.cache_clear()
 
 
 class RadialWheelWidget(QWidget):
@@ -156,6 +166,11 @@ class RadialWheelWidget(QWidget):
             (55, 70),    # Top: start at 55°, span 70°
             (-25, 70),   # Right: start at -25°, span 70°
         ]
+        # Geometry is fixed, so segment outlines are built once
+        self._arc_paths = [self._create_arc_path(start, span) for start, span in self.segments]
+
+        # Static layers (glow rings, hub) cached offscreen; rebuilt on theme change
+        self._bg: Optional[QPixmap] = None
 
         # Animation
         self._scale = 0.0
@@ -194,6 +209,7 @@ class RadialWheelWidget(QWidget):
         """Change theme"""
         self.theme_name = theme_name
         self.theme = load_theme(theme_name)
+        self._bg = None
         self.update()
 
     def update_theme_colors(self, settings: Dict[str, str]):
@@ -201,6 +217,7 @@ class RadialWheelWidget(QWidget):
         for key, value in settings.items():
             if hasattr(self.theme, key):
                 setattr(self.theme, key, value)
+        self._bg = None
         self.update()
 
     def save_current_theme(self, name: str):
@@ -290,16 +307,32 @@ class RadialWheelWidget(QWidget):
         painter.scale(self._scale, self._scale)
         painter.translate(-self.center)
 
-        # Draw layers
-        self._draw_glow(painter)
+        # Draw layers - glow and hub don't overlap the segments, so both come
+        # from the cached background
+        painter.drawPixmap(0, 0, self._background())
         self._draw_segments(painter)
-        self._draw_hub(painter)
         if self.progress is not None:
             self._draw_progress_hub(painter)
         self._draw_title(painter)
         if self.subtitle and self._scale > 0.5:
             self._draw_subtitle(painter)
 
+    def _background(self) -> QPixmap:
+        """Get the static layers, rendering them once per theme and pixel ratio"""
+        dpr = self.devicePixelRatioF()
+        if self._bg is None or self._bg.devicePixelRatio() != dpr:
+            size = math.ceil(self.wheel_size * dpr)
+            self._bg = QPixmap(size, size)
+            self._bg.setDevicePixelRatio(dpr)
+            self._bg.fill(Qt.GlobalColor.transparent)
+
+            painter = QPainter(self._bg)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+            self._draw_glow(painter)
+            self._draw_hub(painter)
+            painter.end()
+        return self._bg
+
     def _draw_glow(self, painter: QPainter):
         """Draw outer glow"""
         # Use glow color for the outer rings
@@ -338,8 +371,7 @@ class RadialWheelWidget(QWidget):
             border_color = QColor(self.theme.accent if is_active else self.theme.border)
             text_color = QColor(self.theme.text_active if is_active else self.theme.text_inactive)
 
-            # Create arc path
-            path = self._create_arc_path(start_angle, span)
+            path = self._arc_paths[i]
 
             # Draw segment with gradient
             gradient = QRadialGradient(self.center, self.outer_radius)
@@ -652,6 +684,7 @@ class QtOverlayManager:
         self.widget: Optional[RadialWheelWidget] = None
         self.theme = theme
         self.hide_timer: Optional[QTimer] = None
+        self._shown_notification: Optional[str] = None  # Message currently on screen
 
     def start(self):
         """Initialize widget"""
@@ -682,6 +715,7 @@ class QtOverlayManager:
 
         def _show():
             self.hide_timer.stop()
+            self._shown_notification = None
             self.widget.show_menu(display, progress, icons)
 
         QTimer.singleShot(0, _show)
@@ -692,6 +726,7 @@ class QtOverlayManager:
             QTimer.singleShot(0, self._do_hide)
 
     def _do_hide(self):
+        self._shown_notification = None
         if self.widget and self.widget.isVisible():
             self.widget.hide_menu()
 
@@ -702,13 +737,16 @@ class QtOverlayManager:
 
         def _show_notif():
             self.hide_timer.stop()
-            display = {
-                'center': message,
-                'left': '',
-                'right': '',
-                'subtitle': ''
-            }
-            self.widget.show_menu(display)
+            # Same notification still on screen (e.g. reconnect flapping):
+            # just extend it instead of re-laying out and re-animating
+            if self._shown_notification != message or not self.widget.isVisible():
+                self.widget.show_menu({
+                    'center': message,
+                    'left': '',
+                    'right': '',
+                    'subtitle': ''
+                })
+                self._shown_notification = message
             self.hide_timer.start(duration_ms)
 
         QTimer.singleShot(0, _show_notif)
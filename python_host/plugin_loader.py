@@ -0,0 +1,25 @@
+"""
+Plugin module loading shared by keychron_app.py and keychron_app_qt.py
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+
+def import_plugin(path: Path):
+    """Import a plugin module from its file without putting its directory on sys.path"""
+    name = path.stem
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
@@ -15,7 +15,8 @@ parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
-from menu_system import MenuMode, AppState, ModeHandler
+from menu_system import MenuMode
+from mode_handlers import SubmenuHandler
 
 logger = logging.getLogger("KeychronApp.AppLauncher")
 
@@ -124,55 +125,6 @@ def launch_operagx():
         logger.error(f"Failed to launch Opera GX: {e}")
 
 
-# ============================================================================
-# APP LAUNCHER MENU HANDLER
-# ============================================================================
-
-class AppLauncherMenuHandler(ModeHandler):
-    """App launcher submenu selector"""
-
-    def __init__(self, state_machine):
-        self.sm = state_machine
-        self.submenus = [
-            {'name': 'Cursor', 'action': launch_cursor},
-            {'name': 'Playnite', 'action': launch_playnite},
-            {'name': 'Opera GX', 'action': launch_operagx}
-        ]
-
-    def on_enter(self, state: AppState):
-        state.submenu_index = 0
-
-    def on_exit(self, state: AppState):
-        pass
-
-    def on_rotation(self, state: AppState, clockwise: bool):
-        """Rotate: Cycle through apps"""
-        if clockwise:
-            state.submenu_index = (state.submenu_index + 1) % len(self.submenus)
-        else:
-            state.submenu_index = (state.submenu_index - 1) % len(self.submenus)
-
-    def on_press(self, state: AppState):
-        """Press: Launch selected app"""
-        submenu = self.submenus[state.submenu_index]
-        if 'action' in submenu:
-            # Execute action
-            submenu['action']()
-            self.sm.exit_menu_mode()
-
-    def get_display_text(self, state: AppState) -> Dict[str, str]:
-        total = len(self.submenus)
-        prev_idx = (state.submenu_index - 1) % total
-        next_idx = (state.submenu_index + 1) % total
-
-        return {
-            'title': '🚀 Apps',
-            'left': self.submenus[prev_idx]['name'],
-            'center': f"▶ {self.submenus[state.submenu_index]['name']}",
-            'right': self.submenus[next_idx]['name']
-        }
-
-
 # ============================================================================
 # PLUGIN INTERFACE
 # ============================================================================
@@ -195,5 +147,9 @@ def get_mode_handlers(state_machine):
     state_machine_ref = state_machine
 
     return {
-        MenuMode.APP_LAUNCHER_MENU: AppLauncherMenuHandler(state_machine)
+        MenuMode.APP_LAUNCHER_MENU: SubmenuHandler(state_machine, [
+            {'name': 'Cursor', 'action': launch_cursor},
+            {'name': 'Playnite', 'action': launch_playnite},
+            {'name': 'Opera GX', 'action': launch_operagx},
+        ], title='🚀 Apps')
     }
@@ -4,7 +4,7 @@ Shows commands relevant to the active application
 """
 
 import logging
-from context_aware import context_manager, ContextCommand
+from context_aware import get_context_manager, ContextCommand
 from menu_system import ModeHandler, AppState, MenuMode
 from typing import Dict, List
 
@@ -26,6 +26,7 @@ class ContextMenuHandler(ModeHandler):
         state.submenu_index = 0
 
         # Get contextual commands
+        context_manager = get_context_manager()
         self.commands = context_manager.get_contextual_commands()
         self.app_name = context_manager.get_current_app_name() or "Application"
 
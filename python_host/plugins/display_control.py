@@ -342,51 +342,9 @@ _state_machine = None
 
 # Mode handlers
 from menu_system import ModeHandler, AppState, MenuMode
+from mode_handlers import SubmenuHandler
 from typing import Dict
 
-class DisplayControlMenuHandler(ModeHandler):
-    """Display control submenu"""
-
-    def __init__(self, state_machine, manager):
-        self.sm = state_machine
-        self.manager = manager
-        self.submenus = [
-            {'name': 'Brightness', 'mode': MenuMode.DISPLAY_BRIGHTNESS},
-            {'name': 'Display Mode', 'mode': MenuMode.DISPLAY_MODE},
-            {'name': 'Toggle Monitor', 'mode': MenuMode.DISPLAY_TOGGLE},
-        ]
-
-    def on_enter(self, state: AppState):
-        state.submenu_index = 0
-
-    def on_exit(self, state: AppState):
-        pass
-
-    def on_rotation(self, state: AppState, clockwise: bool):
-        """Rotate: Select submenu"""
-        if clockwise:
-            state.submenu_index = (state.submenu_index + 1) % len(self.submenus)
-        else:
-            state.submenu_index = (state.submenu_index - 1) % len(self.submenus)
-
-    def on_press(self, state: AppState):
-        """Press: Enter submenu"""
-        submenu = self.submenus[state.submenu_index]
-        self.sm.enter_mode(submenu['mode'])
-
-    def get_display_text(self, state: AppState) -> Dict[str, str]:
-        total = len(self.submenus)
-        prev_idx = (state.submenu_index - 1) % total
-        next_idx = (state.submenu_index + 1) % total
-
-        return {
-            'left': self.submenus[prev_idx]['name'],
-            'center': f"▶ {self.submenus[state.submenu_index]['name']}",
-            'right': self.submenus[next_idx]['name'],
-            'title': '🖥️ Display Control'
-        }
-
-
 class BrightnessControlHandler(ModeHandler):
     """Brightness adjustment"""
 
@@ -589,7 +547,11 @@ def get_mode_handlers(state_machine):
         logger.info(f"Display Manager initialized with {_display_manager.get_monitor_count()} monitor(s)")
 
     return {
-        MenuMode.DISPLAY_MENU: DisplayControlMenuHandler(state_machine, _display_manager),
+        MenuMode.DISPLAY_MENU: SubmenuHandler(state_machine, [
+            {'name': 'Brightness', 'mode': MenuMode.DISPLAY_BRIGHTNESS},
+            {'name': 'Display Mode', 'mode': MenuMode.DISPLAY_MODE},
+            {'name': 'Toggle Monitor', 'mode': MenuMode.DISPLAY_TOGGLE},
+        ], title='🖥️ Display Control'),
         MenuMode.DISPLAY_BRIGHTNESS: BrightnessControlHandler(_display_manager),
         MenuMode.DISPLAY_MODE: DisplayModeHandler(state_machine, _display_manager),
         MenuMode.DISPLAY_TOGGLE: MonitorToggleHandler(state_machine, _display_manager),
@@ -0,0 +1,172 @@
+"""
+Single-producer / single-consumer ring buffer
+
+Replaces queue.Queue on the HID event path: there is exactly one producer
+(the HID reader) and one consumer (the event loop), so no mutex is needed.
+Each index is written by only one side, and CPython int stores/loads are
+atomic under the GIL.
+
+With a factory, every slot is pre-allocated and reused: the producer fills
+the slot returned by claim() in place and then publish()es it, so no object
+is allocated per item.
+
+On free-threaded builds (python3.13t) there is no GIL to order the slot
+write before the index store, so index publication and loads of the other
+side's index go through a lock. On regular builds that lock is None and
+the extra branch is the only cost.
+"""
+
+import sys
+import threading
+from typing import Any, Callable, Optional
+
+# sys._is_gil_enabled() exists from 3.13; older versions always have the GIL
+FREE_THREADED = hasattr(sys, "_is_gil_enabled") and not sys._is_gil_enabled()
+
+
+class SpscRing:
+    """Fixed-size lock-free ring buffer for one producer and one consumer"""
+
+    def __init__(self, size: int = 256, factory: Optional[Callable[[], Any]] = None):
+        if size <= 0 or size & (size - 1):
+            raise ValueError("size must be a power of two")
+
+        self._size = size
+        self._mask = size - 1
+        self._pooled = factory is not None
+        self._buf: list = [factory() for _ in range(size)] if factory else [None] * size
+        self._head = 0  # Next slot to read (consumer only)
+        self._tail = 0  # Next slot to write (producer only)
+        self._not_empty = threading.Event()  # Set on empty -> non-empty
+        # Orders index publication on free-threaded builds only
+        self._index_lock: Optional[threading.Lock] = threading.Lock() if FREE_THREADED else None
+        self.dropped = 0  # Items rejected because the ring was full
+
+    def __len__(self) -> int:
+        return self._tail - self._head
+
+    def put(self, item: Any) -> bool:
+        """Append an item (producer). Returns False if the ring is full."""
+        tail = self._tail
+        if tail - self._load_head() >= self._size:
+            self.dropped += 1
+            return False
+
+        self._buf[tail & self._mask] = item
+        self._publish(tail)
+        return True
+
+    def claim(self) -> Optional[Any]:
+        """Get the pre-allocated slot to fill next (producer, pooled rings).
+
+        Returns None if the ring is full. Call publish() once filled; an
+        unpublished slot is simply reused by the next claim().
+        """
+        tail = self._tail
+        if tail - self._load_head() >= self._size:
+            self.dropped += 1
+            return None
+        return self._buf[tail & self._mask]
+
+    def publish(self):
+        """Make the slot from claim() visible to the consumer (producer)"""
+        self._publish(self._tail)
+
+    def _publish(self, tail: int):
+        lock = self._index_lock
+        if lock is None:
+            self._tail = tail + 1
+        else:
+            with lock:
+                self._tail = tail + 1
+
+        # Only wake the consumer when it may be waiting: it has caught up to
+        # this item. head is read after publishing, so if it is stale the
+        # consumer's re-check in wait() sees the new tail instead.
+        if self._head == tail:
+            self._not_empty.set()
+
+    def get(self) -> Optional[Any]:
+        """Pop the oldest item (consumer), or None if empty
+
+        For pooled rings the returned slot is reused once the producer wraps
+        around, so copy out anything needed beyond the next size - 1 items.
+        """
+        head = self._head
+        if head == self._load_tail():
+            return None
+
+        idx = head & self._mask
+        item = self._buf[idx]
+        if not self._pooled:
+            self._buf[idx] = None
+        self._store_head(head + 1)
+        return item
+
+    def peek(self) -> Optional[Any]:
+        """Get the oldest item without consuming it (consumer), or None if empty
+
+        The slot stays owned by the consumer until release(1).
+        """
+        head = self._head
+        if head == self._load_tail():
+            return None
+        return self._buf[head & self._mask]
+
+    def peek_batch(self, max_n: int) -> list:
+        """Get up to max_n of the oldest items without consuming them (consumer)
+
+        Slots stay owned by the consumer until release(), so pooled items can
+        be read in place. Indices are read once, so the batch is consistent.
+        """
+        head = self._head
+        n = min(self._load_tail() - head, max_n)
+        buf = self._buf
+        mask = self._mask
+        return [buf[(head + i) & mask] for i in range(n)]
+
+    def release(self, n: int):
+        """Consume n items returned by peek_batch() with a single head update (consumer)"""
+        head = self._head
+        if not self._pooled:
+            buf = self._buf
+            mask = self._mask
+            for i in range(n):
+                buf[(head + i) & mask] = None
+        self._store_head(head + n)
+
+    def _load_head(self) -> int:
+        """Read the consumer's index (producer); synchronized when free-threaded"""
+        lock = self._index_lock
+        if lock is None:
+            return self._head
+        with lock:
+            return self._head
+
+    def _load_tail(self) -> int:
+        """Read the producer's index (consumer); synchronized when free-threaded"""
+        lock = self._index_lock
+        if lock is None:
+            return self._tail
+        with lock:
+            return self._tail
+
+    def _store_head(self, head: int):
+        """Publish the consumer's index only after its slot reads (consumer)"""
+        lock = self._index_lock
+        if lock is None:
+            self._head = head
+        else:
+            with lock:
+                self._head = head
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the ring is non-empty (consumer). Returns False on timeout."""
+        if self._head != self._tail:
+            return True
+
+        self._not_empty.clear()
+        # Re-check after clearing so a put() in between isn't missed
+        if self._head != self._tail:
+            return True
+        return self._not_empty.wait(timeout)